@@ -1,7 +1,22 @@
 """Sonos Last.fm scrobbler package."""
 
+from typing import TYPE_CHECKING
+
 from .cli import main
-from .sonos_lastfm import SonosScrobbler
+
+if TYPE_CHECKING:
+    from .sonos_lastfm import SonosScrobbler
 
 __version__ = "0.1.5"
 __all__ = ["main", "SonosScrobbler"]
+
+
+def __getattr__(name: str) -> "type[SonosScrobbler]":
+    """Import SonosScrobbler (and soco with it) only when it is first used."""
+    if name == "SonosScrobbler":
+        # Deferred so the CLI can start without importing soco
+        from .sonos_lastfm import SonosScrobbler  # noqa: PLC0415
+
+        return SonosScrobbler
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
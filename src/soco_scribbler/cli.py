@@ -2,10 +2,10 @@
 
 import os
 from datetime import datetime, timezone
+from functools import cache
 from pathlib import Path
-from typing import Optional, Literal
+from typing import TYPE_CHECKING, Optional, Literal
 
-import pylast  # type: ignore[import-untyped]
 import rich
 import typer
 
@@ -21,6 +21,9 @@ from .config import (
     ensure_user_dirs,
 )
 
+if TYPE_CHECKING:
+    import pylast  # type: ignore[import-untyped]
+
 # Make keyring truly optional
 try:
     import keyring
@@ -125,7 +128,24 @@ def get_stored_credential(key: str) -> Optional[str]:
     if value := os.getenv(env_key):
         return value
 
-    # Then try keyring if available
+    return _load_stored_credential(key)
+
+
+@cache
+def _load_stored_credential(key: str) -> Optional[str]:
+    """Get a credential from the keyring or the config env file.
+
+    Results are cached for the life of the process, since each lookup can
+    mean a keyring round trip and a read of the env file. Storing or
+    deleting a credential clears the cache.
+
+    Args:
+        key: The key to retrieve
+
+    Returns:
+        The stored credential or None if not found
+    """
+    # Try keyring if available
     if HAS_KEYRING:
         try:
             if value := keyring.get_password(APP_NAME, key):
@@ -147,6 +167,8 @@ def store_credential(
         value: The value to store
         storage_type: Where to store the credential (if None, will use available method)
     """
+    _load_stored_credential.cache_clear()
+
     # If storage type is explicitly specified, use that
     if storage_type:
         if storage_type == "keyring" and not HAS_KEYRING:
@@ -177,6 +199,8 @@ def delete_credential(key: str) -> None:
     Args:
         key: The key to delete
     """
+    _load_stored_credential.cache_clear()
+
     if HAS_KEYRING:
         try:
             keyring.delete_password(APP_NAME, key)
@@ -262,6 +286,9 @@ def interactive_setup() -> None:
 @app.command(name="info")
 def show_account_info() -> None:
     """Show Last.fm account information and your recent scrobbles."""
+    # Imported here so commands that don't talk to Last.fm start faster
+    import pylast  # type: ignore[import-untyped]  # noqa: PLC0415
+
     console = Console()
 
     with console.status("Connecting to Last.fm...") as status:
@@ -501,24 +528,28 @@ def run(
     os.environ["LASTFM_PASSWORD"] = final_password
     os.environ["LASTFM_API_KEY"] = final_api_key
     os.environ["LASTFM_API_SECRET"] = final_api_secret
-    os.environ["SCROBBLE_INTERVAL"] = str(scrobble_interval)
-    os.environ["SPEAKER_REDISCOVERY_INTERVAL"] = str(rediscovery_interval)
-    os.environ["SCROBBLE_THRESHOLD_PERCENT"] = str(threshold)
 
     # Import SonosScrobbler only when needed
     from .sonos_lastfm import SonosScrobbler
 
     # Run the scrobbler
-    scrobbler = SonosScrobbler()
+    scrobbler = SonosScrobbler(
+        scrobble_interval=scrobble_interval,
+        rediscovery_interval=rediscovery_interval,
+        threshold_percent=threshold,
+    )
     scrobbler.run()
 
 
-def get_lastfm_network() -> Optional[pylast.LastFMNetwork]:
+def get_lastfm_network() -> Optional["pylast.LastFMNetwork"]:
     """Initialize Last.fm network with stored credentials.
 
     Returns:
         Initialized Last.fm network or None if credentials are missing
     """
+    # Lazy for the same reason as in show_account_info
+    import pylast  # type: ignore[import-untyped]  # noqa: PLC0415
+
     username = get_stored_credential("username")
     password = get_stored_credential("password")
     api_key = get_stored_credential("api_key")
@@ -554,6 +585,9 @@ def show_recent_tracks(
     ),
 ) -> None:
     """Show recently scrobbled tracks."""
+    # Lazy for the same reason as in show_account_info
+    import pylast  # type: ignore[import-untyped]  # noqa: PLC0415
+
     console = Console()
 
     with console.status("Connecting to Last.fm...") as status:
@@ -1,3 +1,4 @@
+import hashlib
 import os
 from pathlib import Path
 from typing import List, Optional
@@ -38,13 +39,30 @@ def validate_config() -> Optional[List[str]]:
     return missing_vars if missing_vars else None
 
 
-def get_config():
+def hash_password(password: Optional[str]) -> Optional[str]:
+    """Hash a Last.fm password the way the Last.fm API expects.
+
+    Args:
+        password: The plaintext password, if set
+
+    Returns:
+        The MD5 hex digest, or None if no password is set
+    """
+    if not password:
+        return None
+    return hashlib.md5(password.encode("utf-8")).hexdigest()  # noqa: S324
+
+
+def get_config(*, require_credentials: bool = True):
     """Get configuration values, validating them first.
 
+    Args:
+        require_credentials: Whether the Last.fm credentials must be set
+
     Raises:
         ValueError: If required environment variables are missing
     """
-    if missing := validate_config():
+    if require_credentials and (missing := validate_config()):
         raise ValueError(
             f"Missing required environment variables: {', '.join(missing)}\n"
             "Please set them in your .env file",
@@ -53,7 +71,8 @@ def get_config():
     return {
         # Last.fm API credentials
         "LASTFM_USERNAME": os.getenv("LASTFM_USERNAME"),
-        "LASTFM_PASSWORD": os.getenv("LASTFM_PASSWORD"),
+        # Only the hash is kept, so the plaintext isn't held for the whole run
+        "LASTFM_PASSWORD_HASH": hash_password(os.getenv("LASTFM_PASSWORD")),
         "LASTFM_API_KEY": os.getenv("LASTFM_API_KEY"),
         "LASTFM_API_SECRET": os.getenv("LASTFM_API_SECRET"),
         # Scrobbling settings
@@ -67,12 +86,15 @@ def get_config():
         ),
         # Data storage paths
         "DATA_DIR": DATA_DIR,
+        # fsync scrobble history writes (slower, but survives power loss)
+        "DURABLE_SCROBBLES": os.getenv("DURABLE_SCROBBLES", "").lower()
+        in ("1", "true", "yes"),
     }
 
 
 # Export config values but don't validate at import time
 LASTFM_USERNAME = os.getenv("LASTFM_USERNAME")
-LASTFM_PASSWORD = os.getenv("LASTFM_PASSWORD")
+LASTFM_PASSWORD_HASH = hash_password(os.getenv("LASTFM_PASSWORD"))
 LASTFM_API_KEY = os.getenv("LASTFM_API_KEY")
 LASTFM_API_SECRET = os.getenv("LASTFM_API_SECRET")
 
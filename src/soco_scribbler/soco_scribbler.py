@@ -2,9 +2,8 @@
 
 from __future__ import annotations
 
-import json
-import os
-from datetime import UTC, datetime
+import atexit
+from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from typing import Any, Optional
@@ -20,7 +19,7 @@ from .config import (
     LOG_DIR,
     ensure_user_dirs,
 )
-from .sonos_lastfm import SonosScrobbler
+from .sonos_lastfm import SonosScrobbler, json_dumps
 from .utils import custom_print
 
 
@@ -31,92 +30,106 @@ class LogFormat(str, Enum):
     TEXT = "text"
 
 
-PLACEHOLDER_CREDENTIALS: dict[str, str] = {
-    "LASTFM_USERNAME": "__soco_scribbler__",
-    "LASTFM_PASSWORD": "__soco_scribbler__",
-    "LASTFM_API_KEY": "__soco_scribbler__",
-    "LASTFM_API_SECRET": "__soco_scribbler__",
-}
-
-
 class SocoScribbler(SonosScrobbler):
     """Sonos scrobbler that logs plays locally instead of calling Last.fm."""
 
-    def __init__(self, log_file: Path, log_format: LogFormat, emit_stdout: bool) -> None:
+    def __init__(
+        self,
+        log_file: Path,
+        log_format: LogFormat,
+        emit_stdout: bool,
+        *,
+        scrobble_interval: int | None = None,
+        rediscovery_interval: int | None = None,
+        threshold_percent: float | None = None,
+    ) -> None:
         self.log_file = log_file
         self.log_format = log_format
         self.emit_stdout = emit_stdout
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
 
-        # Seed placeholder values so that the Last.fm-focused base class initialises.
-        for env_key, placeholder in PLACEHOLDER_CREDENTIALS.items():
-            os.environ.setdefault(env_key, placeholder)
+        # Never talk to Last.fm
+        super().__init__(
+            enable_network=False,
+            scrobble_interval=scrobble_interval,
+            rediscovery_interval=rediscovery_interval,
+            threshold_percent=threshold_percent,
+        )
 
-        super().__init__()
-        self.network = None  # Never talk to Last.fm in logging mode
+        # Kept open for the life of the process; each entry is flushed.
+        # Opened last so a failing base constructor doesn't leak it.
+        self._log_fh = self.log_file.open("ab")
+        atexit.register(self._log_fh.close)
 
     def _prepare_entry(
         self,
         track_info: dict[str, Any],
         timestamp: datetime,
-    ) -> tuple[dict[str, Any], str]:
+    ) -> tuple[dict[str, Any] | None, str | None]:
+        """Build the log record for the configured format only.
+
+        Returns:
+            The JSONL entry and text line; whichever format isn't in use is None
+        """
         duration = track_info.get("duration") or 0
         position = track_info.get("position") or 0
-        threshold_seconds = int(duration * self.scrobble_threshold_percent / 100)
-
-        entry: dict[str, Any] = {
-            "timestamp": timestamp.isoformat(),
-            "artist": track_info.get("artist"),
-            "title": track_info.get("title"),
-            "album": track_info.get("album"),
-            "duration": duration,
-            "position": position,
-            "state": track_info.get("state"),
-            "threshold_percent": self.scrobble_threshold_percent,
-            "threshold_seconds": threshold_seconds,
-            "speaker": track_info.get("speaker"),
-            "speaker_id": track_info.get("speaker_id"),
-        }
-
-        artist = entry.get("artist") or "<unknown artist>"
-        title = entry.get("title") or "<unknown title>"
-        speaker = entry.get("speaker")
+        threshold_seconds = int(duration * self._threshold_ratio)
+        artist = track_info.get("artist")
+        title = track_info.get("title")
+        speaker = track_info.get("speaker")
+
+        if self.log_format is LogFormat.JSONL:
+            return {
+                "timestamp": timestamp.isoformat(),
+                "artist": artist,
+                "title": title,
+                "album": track_info.get("album"),
+                "duration": duration,
+                "position": position,
+                "state": track_info.get("state"),
+                "threshold_percent": self.scrobble_threshold_percent,
+                "threshold_seconds": threshold_seconds,
+                "speaker": speaker,
+                "speaker_id": track_info.get("speaker_id"),
+            }, None
+
         location = f" [{speaker}]" if speaker else ""
         text_line = (
-            f"{entry['timestamp']} | {artist} - {title}{location} "
-            f"({position}/{duration}s, threshold at {threshold_seconds}s)"
+            f"{timestamp.isoformat()} | "
+            f"{artist or '<unknown artist>'} - {title or '<unknown title>'}"
+            f"{location} ({position}/{duration}s, threshold at {threshold_seconds}s)"
         )
+        return None, text_line
 
-        return entry, text_line
-
-    def _write_entry(self, entry: dict[str, Any], text_line: str) -> None:
+    def _write_entry(self, entry: dict[str, Any] | None, text_line: str | None) -> bool:
         try:
-            with self.log_file.open("a", encoding="utf-8") as handle:
-                if self.log_format is LogFormat.JSONL:
-                    handle.write(json.dumps(entry, ensure_ascii=False))
-                else:
-                    handle.write(text_line)
-                handle.write("\n")
+            if entry is not None:
+                self._log_fh.write(json_dumps(entry) + b"\n")
+            if text_line is not None:
+                self._log_fh.write(text_line.encode() + b"\n")
+            self._log_fh.flush()
         except Exception:
             custom_print(f"Failed to write log entry to {self.log_file}", "ERROR")
-        else:
-            if self.emit_stdout:
-                artist = entry.get("artist") or "<unknown artist>"
-                title = entry.get("title") or "<unknown title>"
-                custom_print(f"Logged: {artist} - {title}", "INFO")
+            return False
+        return True
 
-    def scrobble_track(self, track_info: dict[str, Any]) -> None:  # noqa: D401
+    def scrobble_track(  # noqa: D401
+        self,
+        track_info: dict[str, Any],
+        now: datetime,
+    ) -> None:
         """Log track information locally instead of sending it to Last.fm."""
         if not track_info.get("artist") or not track_info.get("title"):
             return
 
-        timestamp = datetime.now(UTC)
-        entry, text_line = self._prepare_entry(track_info, timestamp)
-        self._write_entry(entry, text_line)
+        entry, text_line = self._prepare_entry(track_info, now)
+        if self._write_entry(entry, text_line) and self.emit_stdout:
+            custom_print(
+                f"Logged: {track_info['artist']} - {track_info['title']}",
+                "INFO",
+            )
 
-        track_id = f"{track_info['artist']}-{track_info['title']}"
-        self.last_scrobbled[track_id] = timestamp.isoformat()
-        self.save_json(self.last_scrobbled_file, self.last_scrobbled)
+        self.record_scrobble(track_info, now)
 
 
 @app.command(name="init")
@@ -186,11 +199,6 @@ def scribble(  # noqa: D401
     resolved_log_file = (log_file or DEFAULT_LOG_FILE).expanduser()
     resolved_log_file.parent.mkdir(parents=True, exist_ok=True)
 
-    # Ensure the base class picks up the runtime settings.
-    os.environ["SCROBBLE_INTERVAL"] = str(scrobble_interval)
-    os.environ["SPEAKER_REDISCOVERY_INTERVAL"] = str(rediscovery_interval)
-    os.environ["SCROBBLE_THRESHOLD_PERCENT"] = str(threshold)
-
     rich.print(
         f"[green]Soco Scribbler started.[/green] "
         f"Logging scrobbles to [cyan]{resolved_log_file}[/cyan] "
@@ -201,6 +209,9 @@ def scribble(  # noqa: D401
         log_file=resolved_log_file,
         log_format=log_format,
         emit_stdout=stdout,
+        scrobble_interval=scrobble_interval,
+        rediscovery_interval=rediscovery_interval,
+        threshold_percent=threshold,
     )
     scribbler.run()
 
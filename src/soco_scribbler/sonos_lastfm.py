@@ -1,25 +1,113 @@
 #!/usr/bin/env python3
 """Sonos to Last.fm scrobbler using uv for dependency management."""
 
+import asyncio
+import functools
+import hashlib
 import json
 import logging
+import os
+import random
+import sys
+import threading
 import time
-from datetime import UTC, datetime, timedelta
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any, Final, cast, TypedDict
+from typing import Any, Final, ParamSpec, TypeVar, cast, TypedDict
 
 if True:  # type checking block
     from soco import SoCo  # type: ignore[import-untyped]
 
 import pylast  # type: ignore[import-untyped]
+import requests
 import soco  # type: ignore[import-untyped]
+import soco.services  # type: ignore[import-untyped]
+from requests.adapters import HTTPAdapter
+from soco.events_base import Event  # type: ignore[import-untyped]
+from urllib3.util.retry import Retry
 
 from .config import get_config
-from .utils import custom_print, logger, update_all_progress_displays
+from .utils import (
+    LineCountingStream,
+    SpeakerDisplayInfo,
+    TokenBucket,
+    custom_print,
+    logger,
+    update_all_progress_displays,
+)
+
+# zeroconf is optional; without it speakers are rediscovered with SSDP scans
+try:
+    from zeroconf import ServiceBrowser, ServiceStateChange, Zeroconf
+
+    HAS_ZEROCONF = True
+except ImportError:
+    HAS_ZEROCONF = False
+
+# orjson is optional; the stdlib json module is used when it is missing
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
 
 # Constants
 SCROBBLE_MIN_TIME: Final[int] = 240  # 4 minutes in seconds
-TIME_FORMAT_HMS: Final[int] = 3  # Number of parts in H:MM:SS format
+SCROBBLE_REPEAT_INTERVAL: Final[float] = 1800.0  # 30 minutes in seconds
+SCROBBLE_HISTORY_RETENTION: Final[float] = 3600.0  # 1 hour in seconds
+COMPACTION_INTERVAL: Final[int] = 300  # Seconds between state snapshot rewrites
+SNAPSHOT_RETENTION: Final[float] = 7 * 86400.0  # Keep unseen speakers' state a week
+WRITE_BUFFER_SIZE: Final[int] = 1 << 16  # Buffer size for state file writes
+SCROBBLE_LOG_COMPACT_SIZE: Final[int] = 1 << 16  # Log bytes before a history rewrite
+POLL_WORKERS: Final[int] = 16  # Maximum number of speakers polled at once
+SPEAKER_POLL_TIMEOUT: Final[int] = 10  # Seconds to wait for a speaker to answer
+TRANSPORT_STATE_TTL: Final[int] = 30  # Max seconds to reuse a transport state
+SONOS_SERVICE_TYPE: Final[str] = "_sonos._tcp.local."  # mDNS service type
+EVENT_FALLBACK_POLL_INTERVAL: Final[int] = 60  # Poll idle subscribed speakers
+DISCOVERY_TIMEOUTS: Final[tuple[int, ...]] = (1, 3)  # SSDP waits, retried if empty
+SPEAKER_CHECK_TIMEOUT: Final[float] = 0.5  # Seconds to confirm a device is Sonos
+UPNP_POOL_CONNECTIONS: Final[int] = 16  # Speakers with a pooled UPnP connection
+UPNP_POOL_MAXSIZE: Final[int] = 32  # Kept-alive connections per speaker
+UPNP_CONNECT_RETRIES: Final[int] = 2  # Reconnect attempts before a call fails
+LASTFM_REQUEST_RATE: Final[float] = 5  # Sustained Last.fm requests per second
+LASTFM_REQUEST_BURST: Final[int] = 10  # Last.fm requests allowed in a burst
+SCROBBLE_REQUEST_LIMIT: Final[int] = 50  # Most tracks Last.fm takes per request
+SCROBBLE_MAX_RETRIES: Final[int] = 5  # Retries when Last.fm asks us to back off
+SCROBBLE_MAX_BACKOFF: Final[int] = 300  # Upper bound for a single retry delay
+FLUSH_RETRY_DELAY: Final[int] = 10  # First wait before retrying a failed flush
+
+# Last.fm error codes worth retrying: rate limiting and temporary outages,
+# plus the HTTP 5xx codes newer pylast versions report as WSErrors.
+RETRYABLE_LASTFM_STATUSES: Final[frozenset[str]] = frozenset(
+    {
+        str(pylast.STATUS_OFFLINE),
+        str(pylast.STATUS_TEMPORARILY_UNAVAILABLE),
+        str(pylast.STATUS_RATE_LIMIT_EXCEEDED),
+        "500",
+        "502",
+        "503",
+        "504",
+    },
+)
+
+# Last.fm errors about our credentials rather than the submitted tracks. The
+# tracks stay queued for a later flush instead of being dropped.
+LASTFM_CREDENTIAL_STATUSES: Final[frozenset[str]] = frozenset(
+    {
+        str(pylast.STATUS_AUTH_FAILED),
+        str(pylast.STATUS_INVALID_SK),
+        str(pylast.STATUS_INVALID_API_KEY),
+        str(pylast.STATUS_INVALID_SIGNATURE),
+        str(pylast.STATUS_API_KEY_SUSPENDED),
+    },
+)
 
 
 def assert_not_none(value: str | None, name: str) -> str:
@@ -42,10 +130,119 @@ def assert_not_none(value: str | None, name: str) -> str:
     return value
 
 
+def make_track_id(track_info: dict[str, Any]) -> int:
+    """Build the key used to deduplicate scrobbles of a track.
+
+    The key is a 64-bit hash of the artist and title, so it ignores the
+    speaker and a track playing on several speakers is scrobbled once.
+    `update_track_info` stores it in the track information as "track_id",
+    which is reused when present.
+
+    Args:
+        track_info: Information about the track
+
+    Returns:
+        The track key
+    """
+    track_id: int | None = track_info.get("track_id")
+    if track_id is None:
+        artist: str = track_info.get("artist") or ""
+        title: str = track_info.get("title") or ""
+        track_id = int.from_bytes(
+            hashlib.blake2b(f"{artist}\x00{title}".encode(), digest_size=8).digest(),
+        )
+    return track_id
+
+
+def json_dumps(data: object) -> bytes:
+    """Serialize data to compact UTF-8 encoded JSON.
+
+    Args:
+        data: The data to serialize
+
+    Returns:
+        The JSON document
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+# The result is whatever the document holds; callers check or cast it
+def json_loads(data: bytes | str) -> Any:  # noqa: ANN401
+    """Deserialize a JSON document.
+
+    Args:
+        data: The JSON document
+
+    Returns:
+        The deserialized data
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def parse_time_str(time_str: str | None) -> int:
+    """Convert a Sonos time string to seconds.
+
+    Args:
+        time_str: Time in "H:MM:SS" or "MM:SS" format. Anything else, such as
+            "NOT_IMPLEMENTED" for streams, is treated as zero.
+
+    Returns:
+        The time in seconds
+    """
+    parts: list[str] = (time_str or "").split(":")
+    try:
+        if len(parts) == 3:  # noqa: PLR2004
+            return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
+        if len(parts) == 2:  # noqa: PLR2004
+            return int(parts[0]) * 60 + int(parts[1])
+    except ValueError:
+        pass
+    return 0
+
+
+def install_upnp_session() -> None:
+    """Route SoCo's SOAP requests through a pooled keep-alive session.
+
+    SoCo sends every UPnP action with a bare `requests.post`, which opens a
+    new TCP connection per call. Swapping in a shared session lets repeated
+    calls to the same speaker reuse their connection. Failed connection
+    attempts are retried, which is safe because the action was never sent.
+
+    Last.fm requests can't share the session: pylast opens its own httpx
+    client per request.
+    """
+    if isinstance(soco.services.requests, requests.Session):
+        return
+    session: requests.Session = requests.Session()
+    session.mount(
+        "http://",
+        HTTPAdapter(
+            pool_connections=UPNP_POOL_CONNECTIONS,
+            pool_maxsize=UPNP_POOL_MAXSIZE,
+            max_retries=Retry(
+                total=None,
+                connect=UPNP_CONNECT_RETRIES,
+                read=0,
+                redirect=0,
+                status=0,
+                other=0,
+                backoff_factor=0.1,
+            ),
+        ),
+    )
+    soco.services.requests = session
+
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s",
+    # Count the lines logged so the progress display can redraw above them
+    stream=LineCountingStream(sys.stderr),
     force=True,  # Ensure we reset any existing handlers
 )
 
@@ -64,11 +261,9 @@ httpx_logger: Final[logging.Logger] = logging.getLogger("httpx")
 httpx_logger.setLevel(logging.WARNING)
 httpx_logger.propagate = False
 
-# Storage paths - using local data directory
-DATA_DIR: Final[Path] = Path("data")
-LAST_SCROBBLED_FILE: Final[Path] = DATA_DIR / "last_scrobbled.json"
-CURRENTLY_PLAYING_FILE: Final[Path] = DATA_DIR / "currently_playing.json"
-
+# Connection retries to unreachable speakers are expected; only log failures
+urllib3_logger: Final[logging.Logger] = logging.getLogger("urllib3")
+urllib3_logger.setLevel(logging.ERROR)
 
 class TransportInfo(TypedDict):
     current_transport_state: str
@@ -79,50 +274,240 @@ class TransportInfo(TypedDict):
 class SonosScrobbler:
     """A class to manage Sonos speaker discovery and Last.fm scrobbling."""
 
-    def __init__(self) -> None:
-        """Initialize the scrobbler with Last.fm credentials and speaker discovery."""
+    def __init__(
+        self,
+        *,
+        enable_network: bool = True,
+        scrobble_interval: int | None = None,
+        rediscovery_interval: int | None = None,
+        threshold_percent: float | None = None,
+    ) -> None:
+        """Initialize the scrobbler with Last.fm credentials and speaker discovery.
+
+        Settings that aren't given are read from the environment.
+
+        Args:
+            enable_network: Whether to connect to Last.fm. Without it, no
+                credentials are needed and nothing is submitted.
+            scrobble_interval: Seconds between monitoring passes
+            rediscovery_interval: Seconds between speaker rediscoveries
+            threshold_percent: Percentage of a track to play before scrobbling
+        """
         # Get validated config
-        config = get_config()
+        config = get_config(require_credentials=enable_network)
+
+        install_upnp_session()
 
         self.data_dir: Final[Path] = config["DATA_DIR"]
         self.last_scrobbled_file: Final[Path] = self.data_dir / "last_scrobbled.json"
+        self.scrobble_log_file: Final[Path] = self.data_dir / "last_scrobbled.ndjson"
+        # Snapshot format of older versions, migrated on the first compaction
         self.currently_playing_file: Final[Path] = (
             self.data_dir / "currently_playing.json"
         )
+        self.currently_playing_dir: Final[Path] = self.data_dir / "currently_playing"
+        self.pending_scrobbles_file: Final[Path] = (
+            self.data_dir / "pending_scrobbles.json"
+        )
+        self.events_file: Final[Path] = self.data_dir / "events.ndjson"
+        self.known_speakers_file: Final[Path] = self.data_dir / "known_speakers.json"
+        self.session_file: Final[Path] = self.data_dir / "lastfm_session.json"
 
         # Create data directory if it doesn't exist
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.currently_playing_dir.mkdir(exist_ok=True)
+        # Hash of the content last written to each file by `_write_file`
+        self._written_digests: dict[Path, int] = {}
 
         # Initialize Last.fm network
-        self.network: Final[pylast.LastFMNetwork] = pylast.LastFMNetwork(
+        self.network: pylast.LastFMNetwork | None = None
+        if enable_network:
+            self.connect_lastfm(config)
+
+        # Store config values we'll need later
+        self.scrobble_interval: int = (
+            scrobble_interval
+            if scrobble_interval is not None
+            else config["SCROBBLE_INTERVAL"]
+        )
+        self.speaker_rediscovery_interval: int = (
+            rediscovery_interval
+            if rediscovery_interval is not None
+            else config["SPEAKER_REDISCOVERY_INTERVAL"]
+        )
+        self.scrobble_threshold_percent: float = (
+            threshold_percent
+            if threshold_percent is not None
+            else config["SCROBBLE_THRESHOLD_PERCENT"]
+        )
+        self.durable_scrobbles: bool = config["DURABLE_SCROBBLES"]
+        self._threshold_ratio: float = self.scrobble_threshold_percent / 100.0
+        self._min_interval: float = SCROBBLE_REPEAT_INTERVAL
+
+        # Load or initialize tracking data
+        self.load_scrobble_state()
+        self.load_playing_state()
+        self.init_polling_state()
+
+        # Shared by everything that talks to Last.fm
+        self._lastfm_limiter: Final[TokenBucket] = TokenBucket(
+            rate=LASTFM_REQUEST_RATE,
+            capacity=LASTFM_REQUEST_BURST,
+        )
+
+        # Held while a flush submits the queue, so two flushes never send
+        # the same tracks
+        self._flush_lock: Final[threading.Lock] = threading.Lock()
+        self._flush: asyncio.Future[None] | None = None  # Last background flush
+        # Failed flushes in a row, and the monotonic time before which the
+        # monitoring loop doesn't start another
+        self._flush_failures: int = 0
+        self._next_flush_at: float = 0.0
+        # Held while the queue is serialized and its save queued, so saves
+        # from the monitoring loop and a flush are written in order
+        self._pending_save_lock: Final[threading.Lock] = threading.Lock()
+
+        # Speakers are polled concurrently; results are processed on the
+        # monitoring thread so the tracking state needs no locking.
+        self._pool: Final[ThreadPoolExecutor] = ThreadPoolExecutor(
+            max_workers=POLL_WORKERS,
+            thread_name_prefix="sonos",
+        )
+        # State file writes queued by `queue_write` run here, in order, so
+        # disk latency never stalls the monitoring loop.
+        self._writer: Final[ThreadPoolExecutor] = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="sonos-writer",
+        )
+
+        # Initialize Sonos discovery. The speakers list is replaced rather than
+        # mutated, so readers never need the lock; writers take it.
+        # Speaker names by IP, captured at discovery. SoCo's player_name is a
+        # network call, which fails once a speaker goes offline.
+        self._speaker_names: dict[str, str] = {}
+        self.speakers: list[SoCo] = self.load_known_speakers()
+        self._speakers_lock: Final[threading.Lock] = threading.Lock()
+        self._mdns_speakers: dict[str, str] = {}  # mDNS service name -> IP
+        self._zeroconf: Zeroconf | None = None
+        if self.speakers:
+            # Start polling the remembered speakers right away and reconcile
+            # them with a full discovery in the background.
+            threading.Thread(
+                target=self.discover_speakers,
+                kwargs={"allow_network_scan": True},
+                name="sonos-discovery",
+                daemon=True,
+            ).start()
+        else:
+            self.discover_speakers(allow_network_scan=True)
+        if HAS_ZEROCONF:
+            self.start_speaker_browser()
+
+    def connect_lastfm(self, config: dict[str, Any]) -> None:
+        """Connect to Last.fm with the configured credentials.
+
+        A cached session key skips the authentication round trip pylast
+        otherwise makes here.
+
+        Args:
+            config: The validated configuration
+        """
+        username: str = assert_not_none(
+            config["LASTFM_USERNAME"],
+            "LASTFM_USERNAME",
+        )
+        session_key: str = self.load_session_key(username)
+        self.network = pylast.LastFMNetwork(
             api_key=assert_not_none(config["LASTFM_API_KEY"], "LASTFM_API_KEY"),
             api_secret=assert_not_none(
                 config["LASTFM_API_SECRET"], "LASTFM_API_SECRET"
             ),
-            username=assert_not_none(config["LASTFM_USERNAME"], "LASTFM_USERNAME"),
-            password_hash=pylast.md5(
-                assert_not_none(config["LASTFM_PASSWORD"], "LASTFM_PASSWORD")
+            username=username,
+            password_hash=assert_not_none(
+                config["LASTFM_PASSWORD_HASH"],
+                "LASTFM_PASSWORD",
             ),
+            session_key=session_key,
         )
-
-        # Store config values we'll need later
-        self.scrobble_interval = config["SCROBBLE_INTERVAL"]
-        self.speaker_rediscovery_interval = config["SPEAKER_REDISCOVERY_INTERVAL"]
-        self.scrobble_threshold_percent = config["SCROBBLE_THRESHOLD_PERCENT"]
-
-        # Load or initialize tracking data
-        self.last_scrobbled: dict[str, str] = self.load_json(
-            self.last_scrobbled_file, {}
+        if self.network.session_key != session_key:
+            self.save_session_key()
+
+    def load_scrobble_state(self) -> None:
+        """Load the scrobble history and queue, and open the scrobble log."""
+        self.last_scrobbled: dict[int, float] = self.load_last_scrobbled()
+        # Scrobble history entries in the order they expire, pruned lazily
+        self._scrobble_expiry: deque[tuple[float, int]] = deque(
+            sorted(
+                (scrobbled_at + SCROBBLE_HISTORY_RETENTION, track_id)
+                for track_id, scrobbled_at in self.last_scrobbled.items()
+            ),
         )
-        self.currently_playing: dict[str, dict[str, Any]] = self.load_json(
-            self.currently_playing_file,
-            {},
+        # Scrobbles are appended here and only folded into the history file
+        # by `compact_scrobble_history`. Unbuffered, so each line lands at once.
+        self._scrobble_log_fh = self.scrobble_log_file.open("ab", buffering=0)
+
+        # Scrobbles waiting to be submitted in batched requests. The
+        # queue is persisted so a crash between ticks doesn't lose plays.
+        # The monitoring loop only appends to it while a flush removes
+        # submitted batches from the front, so it needs no lock.
+        self._pending_scrobbles: list[dict[str, Any]] = self.load_json(
+            self.pending_scrobbles_file,
+            {"tracks": []},
+        ).get("tracks", [])
+        # Whether the queue changed since it was last persisted, and the
+        # latest queued save of it
+        self._pending_dirty: bool = False
+        self._pending_save: Future[bool] = Future()
+        self._pending_save.set_result(True)
+        # Scrobbles (track ID, time) queued but not yet in the history log.
+        # They are only logged once the queue holding them is on disk, so a
+        # crash can't leave a play marked as scrobbled but never submitted.
+        self._unlogged_scrobbles: list[tuple[int, float]] = []
+        # Scrobbles the writer thread holds back because the queue holding
+        # them couldn't be saved; only touched on the writer thread
+        self._held_scrobbles: list[tuple[int, float]] = []
+
+    def load_playing_state(self) -> None:
+        """Load the currently playing state and open the event log."""
+        # When each speaker's playing state was last reported
+        self._last_seen: dict[str, float] = {}
+        self.currently_playing: dict[str, dict[str, Any]] = (
+            self.load_currently_playing()
         )
-        self.previous_tracks: dict[str, dict[str, Any]] = {}
+        self.replay_events()
+        # Speakers whose state differs from their snapshot file; replayed
+        # events may have changed any of them, so the first compaction
+        # writes them all.
+        self._dirty_speakers: set[str] = set(self.currently_playing)
+        # Guards `_dirty_speakers`, which the writer thread refills when
+        # snapshots couldn't be written
+        self._snapshot_lock: threading.Lock = threading.Lock()
+
+        # Playback changes are appended to the event log and only folded into
+        # the currently playing snapshot by `compact_state`. Only the writer
+        # thread touches it.
+        self._events_fh = self.events_file.open(
+            "ab",
+            buffering=WRITE_BUFFER_SIZE,
+        )
+        self._last_compaction_time: float = time.time()
 
-        # Initialize Sonos discovery
-        self.speakers: list[SoCo] = []
-        self.discover_speakers()
+    def init_polling_state(self) -> None:
+        """Set up the per-speaker polling and event subscription state."""
+        self.previous_tracks: dict[str, dict[str, Any]] = {}
+        # Last queried transport state and when it was fetched, per speaker
+        self._transport_state_cache: dict[str, tuple[str, float]] = {}
+
+        # UPnP event subscriptions let idle speakers go unpolled until they
+        # report a change. Events arrive on SoCo's listener thread.
+        self._subscriptions: dict[str, Any] = {}
+        self._subscribe_attempts: dict[str, float] = {}
+        self._subscribing: set[str] = set()  # Subscribe requests in flight
+        self._changed_speakers: set[str] = set()
+        self._last_polled: dict[str, float] = {}
+        # Position reported by the last real query and when it was made, used
+        # to estimate the position of playing speakers between queries
+        self._position_anchors: dict[str, tuple[int, float]] = {}
 
     def load_json(
         self,
@@ -140,39 +525,562 @@ class SonosScrobbler:
         """
         try:
             if file_path.exists():
-                with file_path.open() as f:
-                    data = json.load(f)
-                    if not isinstance(data, dict):
-                        logger.exception(
-                            "Invalid JSON data in %s: not a dictionary",
-                            file_path,
-                        )
-                        return default_value
-                    return cast("dict[str, Any]", data)
+                data = json_loads(file_path.read_bytes())
+                if not isinstance(data, dict):
+                    logger.exception(
+                        "Invalid JSON data in %s: not a dictionary",
+                        file_path,
+                    )
+                    return default_value
+                return cast("dict[str, Any]", data)
         except Exception:
             logger.exception("Error loading %s", file_path)
         return default_value
 
-    def save_json(self, file_path: Path, data: dict[str, Any]) -> None:
+    def save_json(
+        self,
+        file_path: Path,
+        data: dict[str, Any],
+        *,
+        durable: bool = False,
+    ) -> bool:
         """Save data to JSON file.
 
+        The data is written to a temporary file which then replaces the
+        target, so readers never see a partially written file. The write is
+        skipped if the content is the same as the last write to the file.
+        It happens in the calling thread; elsewhere use `queue_json`, which
+        writes on the writer thread.
+
+        Args:
+            file_path: Path to save the JSON file
+            data: Data to save
+            durable: Whether to fsync the file before replacing the target
+
+        Returns:
+            True if the file holds the data, False otherwise
+        """
+        try:
+            payload: bytes = json_dumps(data)
+        except Exception:
+            logger.exception("Error saving %s", file_path)
+            return False
+        return self._write_file(file_path, payload, durable=durable)
+
+    def queue_json(
+        self,
+        file_path: Path,
+        data: dict[str, Any],
+        *,
+        durable: bool = False,
+    ) -> Future[bool]:
+        """Save data to JSON file on the writer thread.
+
+        The data is serialized straight away, so later changes to it don't
+        affect the write. Queued writes happen in order, and are all done
+        before the scrobbler shuts down.
+
         Args:
             file_path: Path to save the JSON file
             data: Data to save
+            durable: Whether to fsync the file before replacing the target
+
+        Returns:
+            The write, resolving to True once the file holds the data, or to
+            False if it couldn't be saved
+        """
+        try:
+            payload: bytes = json_dumps(data)
+        except Exception:
+            logger.exception("Error saving %s", file_path)
+            failed: Future[bool] = Future()
+            failed.set_result(False)
+            return failed
+        return self.queue_write(self._write_file, file_path, payload, durable=durable)
+
+    def queue_write(
+        self,
+        fn: Callable[_P, _R],
+        /,
+        *args: _P.args,
+        **kwargs: _P.kwargs,
+    ) -> Future[_R]:
+        """Run a file operation on the writer thread, after those already queued.
+
+        Args:
+            fn: The operation
+            *args: Positional arguments for the operation
+            **kwargs: Keyword arguments for the operation
+
+        Returns:
+            The operation's result, once it has run
         """
         try:
-            with file_path.open("w") as f:
-                json.dump(data, f, indent=2)
+            return self._writer.submit(fn, *args, **kwargs)
+        except RuntimeError:
+            # The writer has shut down; a late write still has to land
+            done: Future[_R] = Future()
+            done.set_result(fn(*args, **kwargs))
+            return done
+
+    def _write_file(self, file_path: Path, payload: bytes, *, durable: bool) -> bool:
+        """Atomically replace a file's content, skipping unchanged content.
+
+        Args:
+            file_path: Path of the file
+            payload: The new content
+            durable: Whether to fsync the file before replacing the target
+
+        Returns:
+            True if the file holds the content, False otherwise
+        """
+        tmp_path: Path = file_path.with_suffix(f"{file_path.suffix}.tmp")
+        try:
+            digest: int = hash(payload)
+            if self._written_digests.get(file_path) == digest:
+                return True
+            with tmp_path.open("wb", buffering=WRITE_BUFFER_SIZE) as f:
+                f.write(payload)
+                if durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+            tmp_path.replace(file_path)
         except Exception:
             logger.exception("Error saving %s", file_path)
+            return False
+        self._written_digests[file_path] = digest
+        return True
+
+    def load_last_scrobbled(self) -> dict[int, float]:
+        """Load scrobble history as epoch seconds keyed by track.
+
+        Track keys are stored as hex strings, since JSON object keys must be
+        strings. Older versions stored ISO 8601 times, which are converted,
+        and "artist-title" keys, which are dropped. Scrobbles logged since
+        the history file was last written are replayed on top of it.
+
+        Returns:
+            Mapping of track key to the time it was last scrobbled
+        """
+        history: dict[str, float | str] = self.load_json(self.last_scrobbled_file, {})
+        last_scrobbled: dict[int, float] = {}
+        for key, scrobbled_at in history.items():
+            try:
+                track_id: int = int(key, 16)
+                last_scrobbled[track_id] = (
+                    datetime.fromisoformat(scrobbled_at).timestamp()
+                    if isinstance(scrobbled_at, str)
+                    else float(scrobbled_at)
+                )
+            except ValueError:
+                logger.debug("Ignoring scrobble history entry %s", key)
+
+        if not self.scrobble_log_file.exists():
+            return last_scrobbled
+        try:
+            with self.scrobble_log_file.open("rb") as f:
+                for line in f:
+                    try:
+                        entry: dict[str, Any] = json_loads(line)
+                        last_scrobbled[int(entry["track_id"], 16)] = float(
+                            entry["ts"],
+                        )
+                    except (ValueError, KeyError, TypeError):
+                        logger.warning("Skipping malformed scrobble: %r", line)
+        except Exception:
+            logger.exception("Error replaying %s", self.scrobble_log_file)
+        return last_scrobbled
+
+    def save_last_scrobbled(self, history: dict[int, float]) -> bool:
+        """Save the scrobble history, with track keys as hex strings.
+
+        Args:
+            history: The scrobble history to save
+
+        Returns:
+            True if the history file holds the history, False otherwise
+        """
+        return self.save_json(
+            self.last_scrobbled_file,
+            {
+                f"{track_id:016x}": scrobbled_at
+                for track_id, scrobbled_at in history.items()
+            },
+            durable=self.durable_scrobbles,
+        )
+
+    def append_scrobble(self, track_id: int, scrobbled_at: float) -> None:
+        """Append a scrobble to the scrobble log.
+
+        Args:
+            track_id: Key of the scrobbled track
+            scrobbled_at: When the track was scrobbled, in epoch seconds
+        """
+        entry: dict[str, Any] = {"track_id": f"{track_id:016x}", "ts": scrobbled_at}
+        try:
+            self._scrobble_log_fh.write(json_dumps(entry) + b"\n")
+            if self.durable_scrobbles:
+                os.fsync(self._scrobble_log_fh.fileno())
+        except Exception:
+            logger.exception("Error appending to %s", self.scrobble_log_file)
+
+    def compact_scrobble_history(self, history: dict[int, float]) -> None:
+        """Rewrite the scrobble history file and truncate the scrobble log.
+
+        Runs on the writer thread. Nothing is rewritten while scrobbles are
+        held back, since the history file would count them as logged.
+
+        Args:
+            history: Copy of the scrobble history, taken on the monitoring
+                loop when its newest scrobbles were handed to the writer
+        """
+        try:
+            if self._scrobble_log_fh.tell() == 0 or self._held_scrobbles:
+                return
+            if self.save_last_scrobbled(history):
+                self._scrobble_log_fh.truncate(0)
+                self._scrobble_log_fh.seek(0)
+        except Exception:
+            logger.exception("Error compacting %s", self.scrobble_log_file)
+
+    def load_session_key(self, username: str) -> str:
+        """Load the cached Last.fm session key for a user.
+
+        Args:
+            username: The Last.fm user the key must belong to
+
+        Returns:
+            The cached session key, or an empty string if there is none
+        """
+        session: dict[str, Any] = self.load_json(self.session_file, {})
+        if session.get("username") != username:
+            return ""
+        return str(session.get("session_key") or "")
+
+    def save_session_key(self) -> None:
+        """Cache the current Last.fm session key, readable only by the owner."""
+        if self.network is None:
+            return
+        tmp_path: Path = self.session_file.with_suffix(".json.tmp")
+        try:
+            fd: int = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(
+                    json_dumps(
+                        {
+                            "username": self.network.username,
+                            "session_key": self.network.session_key,
+                        },
+                    ),
+                )
+            tmp_path.replace(self.session_file)
+        except Exception:
+            logger.exception("Error saving %s", self.session_file)
+
+    def refresh_session_key(self) -> None:
+        """Replace a rejected session key with a freshly generated one."""
+        if self.network is None:
+            return
+        self.session_file.unlink(missing_ok=True)
+        self.network.session_key = pylast.SessionKeyGenerator(
+            self.network,
+        ).get_session_key(self.network.username, self.network.password_hash)
+        self.save_session_key()
+
+    def replay_events(self) -> None:
+        """Apply events logged since the last snapshot to the playing state.
+
+        A partially written final line (e.g. after a crash) or an event
+        missing its speaker or track is skipped.
+        """
+        if not self.events_file.exists():
+            return
+
+        try:
+            with self.events_file.open("rb") as f:
+                for line in f:
+                    try:
+                        event: dict[str, Any] = json_loads(line)
+                        self.currently_playing[event["speaker_id"]] = event["track"]
+                        self._last_seen[event["speaker_id"]] = float(
+                            event.get("ts") or time.time(),
+                        )
+                    except (ValueError, KeyError, TypeError):
+                        logger.warning("Skipping malformed event: %r", line)
+        except Exception:
+            logger.exception("Error replaying %s", self.events_file)
+
+    def record_playing(self, speaker_id: str, track_info: dict[str, Any]) -> None:
+        """Update the currently playing state for a speaker.
+
+        The change is appended to the event log rather than rewriting the
+        whole snapshot. Nothing is written if the state is unchanged.
+
+        Args:
+            speaker_id: ID of the speaker playing the track
+            track_info: Information about the track
+        """
+        self._last_seen[speaker_id] = time.time()
+        if self.currently_playing.get(speaker_id) == track_info:
+            return
+        self.currently_playing[speaker_id] = track_info
+        with self._snapshot_lock:
+            self._dirty_speakers.add(speaker_id)
+        event: dict[str, Any] = {
+            "speaker_id": speaker_id,
+            "track": track_info,
+            "ts": time.time(),
+        }
+        try:
+            self.queue_write(self._append_event, json_dumps(event) + b"\n")
+        except Exception:
+            logger.exception("Error appending to %s", self.events_file)
+
+    def _append_event(self, line: bytes) -> None:
+        """Append a serialized event to the event log on the writer thread.
+
+        Args:
+            line: The event as a line of JSON
+        """
+        try:
+            self._events_fh.write(line)
+        except Exception:
+            logger.exception("Error appending to %s", self.events_file)
+
+    def load_currently_playing(self) -> dict[str, dict[str, Any]]:
+        """Load the currently playing snapshot, one file per speaker.
+
+        A speaker counts as last seen when its snapshot was written.
+
+        Returns:
+            Track information keyed by speaker ID
+        """
+        currently_playing: dict[str, dict[str, Any]] = self.load_json(
+            self.currently_playing_file,
+            {},
+        )
+        if currently_playing:
+            written_at: float = self.currently_playing_file.stat().st_mtime
+            self._last_seen.update(dict.fromkeys(currently_playing, written_at))
+        for speaker_file in self.currently_playing_dir.glob("*.json"):
+            currently_playing[speaker_file.stem] = self.load_json(speaker_file, {})
+            self._last_seen[speaker_file.stem] = speaker_file.stat().st_mtime
+        return currently_playing
+
+    def compact_state(self) -> None:
+        """Snapshot the currently playing state and truncate the event log.
+
+        Only the snapshot files of speakers whose state changed since the last
+        snapshot are rewritten. The state of speakers that haven't been seen
+        for SNAPSHOT_RETENTION is dropped along with their snapshot files.
+        The snapshots are taken here and written on the writer thread, after
+        the events already queued, so the monitoring loop never waits for the
+        disk.
+        """
+        self._last_compaction_time = time.time()
+        gone: list[str] = self.prune_snapshots(
+            self._last_compaction_time - SNAPSHOT_RETENTION,
+        )
+        with self._snapshot_lock:
+            dirty: set[str] = self._dirty_speakers
+            self._dirty_speakers = set()
+        snapshots: dict[str, bytes] = {}
+        try:
+            for speaker_id in dirty:
+                snapshots[speaker_id] = json_dumps(self.currently_playing[speaker_id])
+        except Exception:
+            logger.exception("Error compacting %s", self.events_file)
+            with self._snapshot_lock:
+                self._dirty_speakers |= dirty
+            return
+        if gone or snapshots:
+            self.queue_write(self._write_snapshots, snapshots, gone)
+
+    def _write_snapshots(self, snapshots: dict[str, bytes], gone: list[str]) -> None:
+        """Write snapshot files and truncate the event log on the writer thread.
+
+        Events queued after the snapshots were taken are appended after the
+        truncation, so none are lost. If any snapshot can't be written, the
+        event log is kept and its speakers are snapshotted again next time.
+
+        Args:
+            snapshots: Serialized playing state keyed by speaker ID
+            gone: IDs of speakers whose snapshot files are removed
+        """
+        for speaker_id in gone:
+            speaker_file: Path = self.currently_playing_dir / f"{speaker_id}.json"
+            self._written_digests.pop(speaker_file, None)
+            try:
+                speaker_file.unlink(missing_ok=True)
+            except OSError:
+                logger.exception("Error removing %s", speaker_file)
+        if not snapshots:
+            return
+        failed: list[str] = list(snapshots)
+        try:
+            self._events_fh.flush()
+            failed = [
+                speaker_id
+                for speaker_id, payload in snapshots.items()
+                if not self._write_file(
+                    self.currently_playing_dir / f"{speaker_id}.json",
+                    payload,
+                    durable=False,
+                )
+            ]
+            if not failed:
+                self._events_fh.truncate(0)
+                self.currently_playing_file.unlink(missing_ok=True)
+        except Exception:
+            logger.exception("Error compacting %s", self.events_file)
+        if failed:
+            with self._snapshot_lock:
+                self._dirty_speakers.update(failed)
+
+    def prune_snapshots(self, horizon: float) -> list[str]:
+        """Forget the playing state of speakers not seen since a point in time.
+
+        Args:
+            horizon: Epoch seconds before which a speaker counts as gone
+
+        Returns:
+            IDs of the forgotten speakers, whose snapshot files are obsolete
+        """
+        gone: list[str] = [
+            speaker_id
+            for speaker_id, seen_at in self._last_seen.items()
+            if seen_at < horizon
+        ]
+        for speaker_id in gone:
+            del self._last_seen[speaker_id]
+            self.currently_playing.pop(speaker_id, None)
+            with self._snapshot_lock:
+                self._dirty_speakers.discard(speaker_id)
+            logger.debug("Dropped playing state of unseen speaker %s", speaker_id)
+        return gone
+
+    def load_known_speakers(self) -> list[SoCo]:
+        """Create speakers from the addresses saved by a previous discovery.
+
+        Returns:
+            The remembered speakers, or an empty list if there are none
+        """
+        known: dict[str, Any] = self.load_json(
+            self.known_speakers_file,
+            {"speakers": []},
+        )
+        try:
+            for entry in known["speakers"]:
+                if entry.get("player_name"):
+                    self._speaker_names[entry["ip_address"]] = entry["player_name"]
+            return [soco.SoCo(entry["ip_address"]) for entry in known["speakers"]]
+        except Exception:
+            logger.exception("Error loading %s", self.known_speakers_file)
+            return []
+
+    def save_known_speakers(self) -> None:
+        """Remember the current speakers so the next start can skip discovery."""
+        try:
+            known: list[dict[str, str]] = [
+                {
+                    "ip_address": speaker.ip_address,
+                    "player_name": self.speaker_name(speaker),
+                    "uid": speaker.uid,
+                }
+                for speaker in self.speakers
+            ]
+        except Exception:
+            logger.exception("Error collecting speaker details")
+            return
+        self.queue_json(self.known_speakers_file, {"speakers": known})
+
+    def speaker_name(self, speaker: SoCo) -> str:
+        """Get a speaker's name as captured at discovery, without querying it.
+
+        Args:
+            speaker: The Sonos speaker
+
+        Returns:
+            The speaker's name, or its address if the name isn't known
+        """
+        return self._speaker_names.get(speaker.ip_address) or str(speaker.ip_address)
+
+    def is_sonos_speaker(self, speaker: SoCo) -> bool:
+        """Check that a discovered device really is a reachable Sonos speaker.
+
+        Other UPnP devices sometimes answer discovery first, which would leave
+        every later query to time out. The zone name the speaker reports is
+        remembered as its name.
+
+        Args:
+            speaker: The discovered device
+
+        Returns:
+            True if the device reported a Sonos zone name, False otherwise
+        """
+        try:
+            info: dict[str, Any] = speaker.get_speaker_info(
+                timeout=SPEAKER_CHECK_TIMEOUT,
+            )
+        except Exception:
+            logger.debug("Ignoring non-Sonos device %s", speaker.ip_address)
+            return False
+        name: str | None = info.get("zone_name")
+        if not name:
+            return False
+        self._speaker_names[speaker.ip_address] = name
+        return True
 
-    def discover_speakers(self) -> None:
-        """Discover Sonos speakers on the network."""
+    def find_speakers(self, *, allow_network_scan: bool = False) -> list[SoCo]:
+        """Find reachable Sonos speakers with SSDP discovery.
+
+        Args:
+            allow_network_scan: Whether to fall back to SoCo's scan of the
+                attached networks when nothing answers discovery
+
+        Returns:
+            The speakers found
+        """
+        # Most speakers answer within a second; only slow ones need the
+        # longer wait. discover() returns None if nothing answers.
+        candidates: list[SoCo] = []
+        for timeout in DISCOVERY_TIMEOUTS:
+            candidates = list(soco.discover(timeout=timeout) or ())
+            if candidates:
+                break
+        if not candidates and allow_network_scan:
+            logger.info("No speakers answered discovery, scanning the network")
+            candidates = list(soco.discovery.scan_network() or ())
+        logger.debug("Found %d candidate speakers", len(candidates))
+        return [
+            speaker
+            for speaker, is_sonos in zip(
+                candidates,
+                self._pool.map(self.is_sonos_speaker, candidates),
+                strict=True,
+            )
+            if is_sonos
+        ]
+
+    def discover_speakers(self, *, allow_network_scan: bool = False) -> None:
+        """Discover Sonos speakers on the network.
+
+        Args:
+            allow_network_scan: Whether to scan the attached networks when
+                nothing answers discovery. Scanning is slow and noisy, so it
+                is only done when the scrobbler starts.
+        """
         try:
-            new_speakers: list[SoCo] = list(soco.discover())
+            new_speakers: list[SoCo] = self.find_speakers(
+                allow_network_scan=allow_network_scan,
+            )
+
+            # Update the speakers list
+            old_speakers: list[SoCo] = self.replace_speakers(new_speakers)
+            new_speakers = self.speakers
 
             # Get sets of speaker IDs for comparison
-            old_speaker_ids: set[str] = {s.ip_address for s in self.speakers}
+            old_speaker_ids: set[str] = {s.ip_address for s in old_speakers}
             new_speaker_ids: set[str] = {s.ip_address for s in new_speakers}
 
             # Detect changes
@@ -180,27 +1088,27 @@ class SonosScrobbler:
             removed_speakers: set[str] = old_speaker_ids - new_speaker_ids
 
             # Only log if there are changes
+            for speaker in new_speakers:
+                if speaker.ip_address in added_speakers:
+                    custom_print(
+                        f"New speaker found: {self.speaker_name(speaker)} "
+                        f"({speaker.ip_address})",
+                    )
+            for speaker in old_speakers:
+                if speaker.ip_address in removed_speakers:
+                    custom_print(
+                        f"Speaker removed: {self.speaker_name(speaker)} "
+                        f"({speaker.ip_address})",
+                    )
             if added_speakers or removed_speakers:
-                if added_speakers:
-                    for speaker in new_speakers:
-                        if speaker.ip_address in added_speakers:
-                            custom_print(
-                                "New speaker found: "
-                                f"{speaker.player_name} ({speaker.ip_address})",
-                            )
-
-                if removed_speakers:
-                    for speaker in self.speakers:
-                        if speaker.ip_address in removed_speakers:
-                            custom_print(
-                                "Speaker removed: "
-                                f"{speaker.player_name} ({speaker.ip_address})",
-                            )
-
                 custom_print(f"Updated speaker count: {len(new_speakers)}")
 
-            # Update the speakers list
-            self.speakers = new_speakers
+            if (
+                added_speakers
+                or removed_speakers
+                or not self.known_speakers_file.exists()
+            ):
+                self.save_known_speakers()
 
             # Log warning only if we have no speakers at all
             if not self.speakers:
@@ -209,14 +1117,122 @@ class SonosScrobbler:
         except Exception:
             custom_print("Error discovering speakers", "ERROR")
             logger.exception("Error discovering speakers")
-            self.speakers = []
+            self.replace_speakers([])
+
+    def replace_speakers(self, speakers: list[SoCo]) -> list[SoCo]:
+        """Replace the speakers list with the result of a discovery.
+
+        Speakers mDNS is tracking are kept even if the discovery missed them,
+        so an announcement handled while discovery ran isn't undone.
+
+        Args:
+            speakers: The discovered speakers
+
+        Returns:
+            The previous speakers list
+        """
+        with self._speakers_lock:
+            tracked: set[str] = set(self._mdns_speakers.values())
+            found: set[str] = {s.ip_address for s in speakers}
+            old_speakers: list[SoCo] = self.speakers
+            self.speakers = [
+                *speakers,
+                *(
+                    s
+                    for s in old_speakers
+                    if s.ip_address in tracked and s.ip_address not in found
+                ),
+            ]
+        return old_speakers
+
+    def start_speaker_browser(self) -> None:
+        """Track speakers as they come and go using mDNS service announcements.
+
+        Once the browser is running, periodic SSDP rediscovery is skipped.
+        """
+        try:
+            self._zeroconf = Zeroconf()
+            ServiceBrowser(
+                self._zeroconf,
+                SONOS_SERVICE_TYPE,
+                handlers=[self._on_service_state_change],
+            )
+        except Exception:
+            logger.exception("Error starting mDNS speaker browser")
+            self._zeroconf = None
 
-    def should_scrobble(self, track_info: dict[str, Any], speaker_id: str) -> bool:
+    def _on_service_state_change(
+        self,
+        zeroconf: "Zeroconf",
+        service_type: str,
+        name: str,
+        state_change: "ServiceStateChange",
+    ) -> None:
+        """Add or remove a speaker in response to an mDNS announcement.
+
+        Args:
+            zeroconf: The Zeroconf instance that saw the change
+            service_type: The mDNS service type of the announcement
+            name: The mDNS service name of the speaker
+            state_change: Whether the service was added, updated or removed
+        """
+        try:
+            if state_change is ServiceStateChange.Removed:
+                with self._speakers_lock:
+                    ip_address: str | None = self._mdns_speakers.pop(name, None)
+                    removed: list[SoCo] = [
+                        s for s in self.speakers if s.ip_address == ip_address
+                    ]
+                    self.speakers = [
+                        s for s in self.speakers if s.ip_address != ip_address
+                    ]
+                for speaker in removed:
+                    custom_print(
+                        f"Speaker removed: {self.speaker_name(speaker)} "
+                        f"({ip_address})",
+                    )
+                if removed:
+                    self.save_known_speakers()
+                return
+
+            info = zeroconf.get_service_info(service_type, name)
+            if info is None:
+                return
+            addresses: list[str] = info.parsed_addresses()
+            if not addresses:
+                return
+
+            announced: SoCo = soco.SoCo(addresses[0])
+            # Bonded satellites and subwoofers announce themselves too
+            if not announced.is_visible:
+                return
+            self._speaker_names[announced.ip_address] = announced.player_name
+
+            with self._speakers_lock:
+                self._mdns_speakers[name] = announced.ip_address
+                if any(s.ip_address == announced.ip_address for s in self.speakers):
+                    return
+                self.speakers = [*self.speakers, announced]
+            custom_print(
+                f"New speaker found: {self.speaker_name(announced)} "
+                f"({announced.ip_address})",
+            )
+            self.save_known_speakers()
+        except Exception:
+            logger.exception("Error handling mDNS announcement for %s", name)
+
+    def should_scrobble(
+        self,
+        track_info: dict[str, Any],
+        speaker_id: str,
+        now: datetime,
+    ) -> bool:
         """Determine if a track should be scrobbled based on Last.fm rules and history.
 
         Args:
             track_info: Information about the track
             speaker_id: ID of the speaker playing the track
+            now: Time of the current monitoring pass
 
         Returns:
             True if the track should be scrobbled, False otherwise
@@ -224,239 +1240,887 @@ class SonosScrobbler:
         if not track_info.get("artist") or not track_info.get("title"):
             return False
 
-        track_id: str = f"{track_info['artist']}-{track_info['title']}"
-        current_time: datetime = datetime.now(UTC)
-
         # Check if track was recently scrobbled
-        if track_id in self.last_scrobbled:
-            last_scrobble_time: datetime = datetime.fromisoformat(
-                self.last_scrobbled[track_id],
-            )
-            if (current_time - last_scrobble_time) < timedelta(minutes=30):
-                return False
+        last_scrobble_time: float = self.last_scrobbled.get(
+            make_track_id(track_info),
+            0.0,
+        )
+        if (now.timestamp() - last_scrobble_time) < self._min_interval:
+            return False
 
         # Check if track meets scrobbling criteria
         if speaker_id in self.currently_playing:
             current_track: dict[str, Any] = self.currently_playing[speaker_id]
             position: int = current_track.get("position", 0)
             duration: int = current_track.get("duration", 0)
-
-            threshold_decimal: float = self.scrobble_threshold_percent / 100.0
-            return (position >= duration * threshold_decimal) or (
-                position >= SCROBBLE_MIN_TIME
-            )
+            return position >= self.scrobble_point(duration)
 
         return False
 
-    def update_track_info(self, speaker: SoCo) -> dict[str, Any]:
+    def scrobble_point(self, duration: int) -> float:
+        """Get the playback position at which a track becomes scrobblable.
+
+        Args:
+            duration: Track duration in seconds
+
+        Returns:
+            The position in seconds
+        """
+        return min(duration * self._threshold_ratio, SCROBBLE_MIN_TIME)
+
+    def update_track_info(
+        self,
+        speaker: SoCo,
+        *,
+        with_state: bool = True,
+    ) -> dict[str, Any]:
         """Get current track information from a speaker.
 
         Args:
             speaker: The Sonos speaker to get information from
+            with_state: Whether to look up the transport state. If not, the
+                caller fills in "state" itself.
 
         Returns:
             Dictionary containing track information
         """
         try:
             track_info: dict[str, Any] = speaker.get_current_track_info()
-            logger.debug(
-                "Raw track info from %s: %s",
-                speaker.player_name,
-                track_info,
-            )
-            # Parse duration (format "0:04:32" or "4:32")
-            duration_parts: list[str] = track_info.get("duration", "0:00").split(
-                ":",
-            )
-            if duration_parts[0] == "NOT_IMPLEMENTED":
-                duration_parts = [0, 0]
-            
-            logger.debug(
-                "duration parts: %s: %s", track_info.get("duration", None), duration_parts
-            )
-            
-            if len(duration_parts) == TIME_FORMAT_HMS:  # "H:MM:SS"
-                duration: int = (
-                    int(duration_parts[0]) * 3600
-                    + int(duration_parts[1]) * 60
-                    + int(duration_parts[2])
+            duration: int = parse_time_str(track_info.get("duration"))
+            position: int = parse_time_str(track_info.get("position"))
+
+            # Only build the debug output when it's logged
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Raw track info from %s: %s",
+                    self.speaker_name(speaker),
+                    track_info,
                 )
-            else:  # "MM:SS"
-                duration = int(duration_parts[0]) * 60 + int(duration_parts[1])
-
-            # Parse position (format "0:02:45" or "2:45")
-            position_parts: list[str] = track_info.get("position", "0:00").split(
-                ":",
-            )
-
-            if position_parts[0] == "NOT_IMPLEMENTED":
-                position_parts = [0, 0]
-            
-            logger.debug(
-                "position part: %s: %s", track_info.get("position", None), position_parts
-            )
-            if len(position_parts) == TIME_FORMAT_HMS:  # "H:MM:SS"
-                position: int = (
-                    int(position_parts[0]) * 3600
-                    + int(position_parts[1]) * 60
-                    + int(position_parts[2])
+                logger.debug(
+                    "Parsed times for %s: position=%s->(%ds), duration=%s->(%ds)",
+                    track_info.get("title"),
+                    track_info.get("position"),
+                    position,
+                    track_info.get("duration"),
+                    duration,
                 )
-            else:  # "MM:SS"
-                position = int(position_parts[0]) * 60 + int(position_parts[1])
 
-            logger.debug(
-                "Parsed times for %s: position=%s->(%ds), duration=%s->(%ds)",
-                track_info.get("title"),
-                track_info.get("position"),
-                position,
-                track_info.get("duration"),
-                duration,
-            )
-
-            transport_info: TransportInfo = speaker.get_current_transport_info()  # type: ignore[assignment]
-            return {
+            info: dict[str, Any] = {
                 "artist": track_info.get("artist"),
                 "title": track_info.get("title"),
                 "album": track_info.get("album"),
                 "duration": duration,
                 "position": position,
-                "state": transport_info.get("current_transport_state"),
+                "state": (
+                    self.get_transport_state(speaker, track_info, position)
+                    if with_state
+                    else ""
+                ),
             }
+            info["track_id"] = make_track_id(info)
         except Exception:
-            logger.exception("Error getting track info from %s", speaker.player_name)
+            logger.exception(
+                "Error getting track info from %s",
+                self.speaker_name(speaker),
+            )
             return {}
+        return info
 
-    def scrobble_track(self, track_info: dict[str, Any]) -> None:
-        """Scrobble a track to Last.fm.
+    def subscribe_to_events(self, speaker: SoCo) -> None:
+        """Subscribe to playback events from a speaker on the worker pool.
+
+        The SUBSCRIBE request to an unreachable speaker only fails once its
+        HTTP timeout runs out, so it never runs on the monitoring loop.
+        Failed attempts are retried after EVENT_FALLBACK_POLL_INTERVAL; until
+        then the speaker is polled every cycle.
 
         Args:
-            track_info: Information about the track to scrobble
+            speaker: The Sonos speaker to subscribe to
         """
+        speaker_id: str = speaker.ip_address
+        now: float = time.time()
+        last_attempt: float = self._subscribe_attempts.get(speaker_id, 0)
+        if (
+            speaker_id in self._subscribing
+            or now - last_attempt < EVENT_FALLBACK_POLL_INTERVAL
+        ):
+            return
+        self._subscribe_attempts[speaker_id] = now
+        self._subscribing.add(speaker_id)
         try:
-            self.network.scrobble(
-                artist=track_info["artist"],
-                title=track_info["title"],
-                timestamp=int(time.time()),
-                album=track_info.get("album", ""),
-            )
+            self._pool.submit(self._subscribe, speaker)
+        except RuntimeError:
+            # The pool has shut down
+            self._subscribing.discard(speaker_id)
 
-            # Update last scrobbled time
-            track_id: str = f"{track_info['artist']}-{track_info['title']}"
-            self.last_scrobbled[track_id] = datetime.now(UTC).isoformat()
-            self.save_json(self.last_scrobbled_file, self.last_scrobbled)
+    def _subscribe(self, speaker: SoCo) -> None:
+        """Make a speaker's event subscription and record it.
 
-            custom_print(f"Scrobbled: {track_info['artist']} - {track_info['title']}")
+        Args:
+            speaker: The Sonos speaker to subscribe to
+        """
+        speaker_id: str = speaker.ip_address
+        try:
+            subscription = speaker.avTransport.subscribe(auto_renew=True)
         except Exception:
-            logger.exception("Error scrobbling track")
-            custom_print("Error scrobbling track", "ERROR")
+            logger.debug(
+                "Could not subscribe to events from %s, polling instead",
+                speaker_id,
+                exc_info=True,
+            )
+        else:
+            subscription.callback = functools.partial(self._handle_event, speaker_id)
+            subscription.auto_renew_fail = functools.partial(
+                self._handle_subscription_lost,
+                speaker_id,
+            )
+            self._subscriptions[speaker_id] = subscription
+        finally:
+            self._subscribing.discard(speaker_id)
 
-    def monitor_speakers(self) -> None:
-        """Main loop to monitor speakers and scrobble tracks."""
-        custom_print("Starting Sonos Last.fm Scrobbler")
-        display_info: dict[str, dict[str, Any]] = {}
-        last_discovery_time: float = 0
-        try:
-            while True:
-                # Check if it's time to rediscover speakers
-                current_time: float = time.time()
-                if (
-                    current_time - last_discovery_time
-                    >= self.speaker_rediscovery_interval
-                ):
-                    self.discover_speakers()
-                    last_discovery_time = current_time
+    def _handle_event(self, speaker_id: str, event: Event) -> None:
+        """Record a playback event so the speaker is polled on the next cycle.
 
-                display_info.clear()  # Reset display info each iteration
+        Args:
+            speaker_id: ID of the speaker that sent the event
+            event: The SoCo event
+        """
+        state: str | None = event.variables.get("transport_state")
+        if state:
+            self._transport_state_cache[speaker_id] = (state, time.time())
+        self._changed_speakers.add(speaker_id)
+
+    def _handle_subscription_lost(self, speaker_id: str, _exc: Exception) -> None:
+        """Fall back to polling a speaker whose subscription couldn't be renewed.
+
+        Args:
+            speaker_id: ID of the speaker whose subscription was lost
+            _exc: The error raised while renewing
+        """
+        logger.warning("Lost event subscription for %s, polling instead", speaker_id)
+        self._subscriptions.pop(speaker_id, None)
+
+    def unsubscribe_all(self) -> None:
+        """Cancel all event subscriptions and stop SoCo's event listener."""
+        for speaker_id, subscription in list(self._subscriptions.items()):
+            try:
+                subscription.unsubscribe()
+            except Exception:
+                logger.debug("Error unsubscribing from %s", speaker_id, exc_info=True)
+        self._subscriptions.clear()
+        if soco.events.event_listener.is_running:
+            soco.events.event_listener.stop()
+
+    def needs_poll(self, speaker: SoCo, now: float) -> bool:
+        """Determine if a speaker has to be queried on this cycle.
+
+        Speakers without an event subscription are always polled. Subscribed
+        speakers are polled after reporting a change, when the estimated
+        position of a playing track first reaches the scrobble point, and every
+        EVENT_FALLBACK_POLL_INTERVAL seconds in case an event was missed.
+
+        Args:
+            speaker: The Sonos speaker to check
+            now: Current time as a Unix timestamp
+
+        Returns:
+            True if the speaker should be queried, False otherwise
+        """
+        speaker_id: str = speaker.ip_address
+        if speaker_id not in self._subscriptions:
+            self.subscribe_to_events(speaker)
+            return True
+        if speaker_id in self._changed_speakers:
+            self._changed_speakers.discard(speaker_id)
+            return True
+        if speaker_id not in self.previous_tracks:
+            return True
+        last_polled: float = self._last_polled.get(speaker_id, 0)
+        if now - last_polled >= EVENT_FALLBACK_POLL_INTERVAL:
+            return True
+
+        state: str = self._transport_state_cache.get(speaker_id, ("", 0.0))[0]
+        if state != "PLAYING":
+            return False
+
+        # Verify the real position once the estimate crosses the scrobble point
+        anchor_position, anchor_time = self._position_anchors.get(
+            speaker_id,
+            (0, 0.0),
+        )
+        scrobble_point: float = self.scrobble_point(
+            self.previous_tracks[speaker_id].get("duration", 0),
+        )
+        return anchor_position < scrobble_point <= anchor_position + now - anchor_time
+
+    def estimate_track_info(self, speaker_id: str, now: float) -> dict[str, Any]:
+        """Estimate current track information for a speaker without querying it.
+
+        Playback advances at one second per second, so the position of a
+        playing track is extrapolated from the last real query.
+
+        Args:
+            speaker_id: ID of the speaker
+            now: Current time as a Unix timestamp
+
+        Returns:
+            The previous track information with an estimated position
+        """
+        track_info: dict[str, Any] = dict(self.previous_tracks.get(speaker_id, {}))
+        anchor: tuple[int, float] | None = self._position_anchors.get(speaker_id)
+        if anchor is not None and track_info.get("state") == "PLAYING":
+            position: int = anchor[0] + int(now - anchor[1])
+            duration: int = track_info.get("duration", 0)
+            track_info["position"] = min(position, duration) if duration else position
+        return track_info
+
+    async def poll_speakers(self) -> list[tuple[SoCo, dict[str, Any]]]:
+        """Get current track information from all speakers concurrently.
+
+        The blocking SoCo queries run on the worker pool. Speakers that don't
+        need to be queried (see `needs_poll`) report their estimated track
+        information.
+
+        Returns:
+            Pairs of speaker and track information, in speaker order. Speakers
+            that don't answer within SPEAKER_POLL_TIMEOUT seconds are left out.
+        """
+        now: float = time.time()
+        futures: list[tuple[SoCo, asyncio.Future[dict[str, Any]] | None]] = []
+        future: asyncio.Future[dict[str, Any]] | None
+        for speaker in self.speakers:
+            if self.needs_poll(speaker, now):
+                self._last_polled[speaker.ip_address] = now
+                future = asyncio.ensure_future(self.fetch_track_info(speaker))
+                futures.append((speaker, future))
+            else:
+                futures.append((speaker, None))
+        pending: list[asyncio.Future[dict[str, Any]]] = [
+            future for _, future in futures if future is not None
+        ]
+        not_done: set[asyncio.Future[dict[str, Any]]] = set()
+        if pending:
+            _, not_done = await asyncio.wait(pending, timeout=SPEAKER_POLL_TIMEOUT)
+
+        results: list[tuple[SoCo, dict[str, Any]]] = []
+        for speaker, future in futures:
+            if future is None:
+                results.append(
+                    (speaker, self.estimate_track_info(speaker.ip_address, now)),
+                )
+            elif future in not_done:
+                logger.warning("Timed out polling %s", speaker.ip_address)
+            else:
+                track_info: dict[str, Any] = future.result()
+                if track_info:
+                    self._position_anchors[speaker.ip_address] = (
+                        track_info["position"],
+                        now,
+                    )
+                results.append((speaker, track_info))
+        return results
+
+    async def fetch_track_info(self, speaker: SoCo) -> dict[str, Any]:
+        """Get current track information from a speaker on the worker pool.
+
+        When the cached transport state has expired it can't be reused
+        whatever the track is, so the speaker is asked for it at the same
+        time as the track instead of afterwards.
+
+        Args:
+            speaker: The Sonos speaker to get information from
+
+        Returns:
+            Dictionary containing track information, empty on error
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        if not self.transport_state_expired(speaker.ip_address):
+            return await loop.run_in_executor(
+                self._pool,
+                self.update_track_info,
+                speaker,
+            )
+
+        state: str | BaseException
+        track_info: dict[str, Any] | BaseException
+        state, track_info = await asyncio.gather(
+            loop.run_in_executor(self._pool, self.fetch_transport_state, speaker),
+            loop.run_in_executor(
+                self._pool,
+                functools.partial(self.update_track_info, speaker, with_state=False),
+            ),
+            return_exceptions=True,
+        )
+        if isinstance(state, BaseException):
+            logger.error(
+                "Error getting transport info from %s",
+                speaker.ip_address,
+                exc_info=state,
+            )
+            return {}
+        if isinstance(track_info, BaseException):
+            raise track_info
+        if track_info:
+            track_info["state"] = state
+        return track_info
+
+    def transport_state_expired(self, speaker_id: str) -> bool:
+        """Check whether a speaker's cached transport state is too old to reuse.
+
+        Args:
+            speaker_id: ID of the speaker
+
+        Returns:
+            True if there is no cached state younger than TRANSPORT_STATE_TTL
+        """
+        cached: tuple[str, float] | None = self._transport_state_cache.get(speaker_id)
+        return cached is None or time.time() - cached[1] >= TRANSPORT_STATE_TTL
+
+    def fetch_transport_state(self, speaker: SoCo) -> str:
+        """Query a speaker's transport state and cache it.
+
+        Args:
+            speaker: The Sonos speaker to get the state from
+
+        Returns:
+            The current transport state, e.g. "PLAYING"
+        """
+        transport_info: TransportInfo = speaker.get_current_transport_info()  # type: ignore[assignment]
+        state: str = transport_info.get("current_transport_state", "")
+        self._transport_state_cache[speaker.ip_address] = (state, time.time())
+        return state
 
-                for speaker in self.speakers:
+    def get_transport_state(
+        self,
+        speaker: SoCo,
+        track_info: dict[str, Any],
+        position: int,
+    ) -> str:
+        """Get the transport state of a speaker, reusing the cached one if valid.
+
+        The cached state is reused while it is younger than TRANSPORT_STATE_TTL,
+        the same track is loaded, and the position movement agrees with it (the
+        position only advances while playing). Otherwise the speaker is queried.
+
+        Args:
+            speaker: The Sonos speaker to get the state from
+            track_info: Raw track information from the same poll
+            position: Parsed playback position in seconds
+
+        Returns:
+            The current transport state, e.g. "PLAYING"
+        """
+        speaker_id: str = speaker.ip_address
+        cached: tuple[str, float] | None = self._transport_state_cache.get(speaker_id)
+        prev_track: dict[str, Any] = self.previous_tracks.get(speaker_id, {})
+
+        if (
+            cached is not None
+            and not self.transport_state_expired(speaker_id)
+            and prev_track.get("artist") == track_info.get("artist")
+            and prev_track.get("title") == track_info.get("title")
+            and (cached[0] == "PLAYING") == (position > prev_track.get("position", 0))
+        ):
+            return cached[0]
+
+        return self.fetch_transport_state(speaker)
+
+    def scrobble_track(self, track_info: dict[str, Any], now: datetime) -> None:
+        """Queue a track to be scrobbled to Last.fm.
+
+        The track is submitted by the next call to `flush_scrobbles`, which
+        the monitoring loop starts after every pass. It batches the queued
+        tracks into as few requests as possible.
+
+        Args:
+            track_info: Information about the track to scrobble
+            now: Time of the current monitoring pass
+        """
+        self._pending_scrobbles.append(
+            {
+                "artist": track_info["artist"],
+                "title": track_info["title"],
+                "timestamp": int(now.timestamp()),
+                "album": track_info.get("album") or None,
+            },
+        )
+        self._pending_dirty = True
+
+        self.record_scrobble(track_info, now)
+
+    def record_scrobble(
+        self,
+        track_info: dict[str, Any],
+        timestamp: datetime,
+    ) -> None:
+        """Remember when a track was scrobbled to prevent repeat scrobbles.
+
+        Entries older than SCROBBLE_HISTORY_RETENTION can no longer block a
+        scrobble and are dropped, keeping the history bounded. Only expired
+        entries are visited, rather than the whole history.
+
+        Args:
+            track_info: Information about the scrobbled track
+            timestamp: When the track was scrobbled
+        """
+        scrobbled_at: float = timestamp.timestamp()
+        expiry: deque[tuple[float, int]] = self._scrobble_expiry
+        while expiry and expiry[0][0] < scrobbled_at:
+            _, track_id = expiry.popleft()
+            last_scrobble_time: float | None = self.last_scrobbled.get(track_id)
+            # A later scrobble of the same track has its own, later expiry
+            if (
+                last_scrobble_time is not None
+                and last_scrobble_time + SCROBBLE_HISTORY_RETENTION < scrobbled_at
+            ):
+                del self.last_scrobbled[track_id]
+
+        track_id = make_track_id(track_info)
+        self.last_scrobbled[track_id] = scrobbled_at
+        expiry.append((scrobbled_at + SCROBBLE_HISTORY_RETENTION, track_id))
+        self._unlogged_scrobbles.append((track_id, scrobbled_at))
+
+    def save_pending_scrobbles(self) -> Future[bool]:
+        """Persist the scrobble queue if it changed since it was last saved.
+
+        The queue is serialized straight away and written on the writer
+        thread, so this never waits for the disk.
+
+        Returns:
+            The latest save of the queue, resolving to True once the file
+            holds the queue as it is now, or to False if saving it failed
+        """
+        with self._pending_save_lock:
+            if self._pending_dirty:
+                self._pending_dirty = False
+                self._pending_save = self.queue_write(
+                    self._write_pending_scrobbles,
+                    json_dumps({"tracks": self._pending_scrobbles}),
+                )
+            return self._pending_save
+
+    def _write_pending_scrobbles(self, payload: bytes) -> bool:
+        """Write the serialized scrobble queue on the writer thread.
+
+        A failed write marks the queue as changed, so the next save retries.
+
+        Args:
+            payload: The serialized queue
+
+        Returns:
+            True if the file holds the queue, False otherwise
+        """
+        saved: bool = self._write_file(
+            self.pending_scrobbles_file,
+            payload,
+            durable=self.durable_scrobbles,
+        )
+        if not saved:
+            self._pending_dirty = True
+        return saved
+
+    def commit_scrobbles(self) -> None:
+        """Persist the scrobble queue, then log its new plays as scrobbled.
+
+        Both happen on the writer thread, in that order, so the monitoring
+        loop never waits for the disk. The history log only records a play
+        once the queue holding it is on disk, so a crash before it is
+        submitted neither loses the play nor stops it from being scrobbled
+        again.
+        """
+        saved: Future[bool] = self.save_pending_scrobbles()
+        if not self._unlogged_scrobbles and not self._held_scrobbles:
+            return
+        unlogged: list[tuple[int, float]] = self._unlogged_scrobbles
+        self._unlogged_scrobbles = []
+        self.queue_write(
+            self._log_scrobbles,
+            saved,
+            unlogged,
+            self.last_scrobbled.copy(),
+        )
+
+    def _log_scrobbles(
+        self,
+        saved: Future[bool],
+        scrobbles: list[tuple[int, float]],
+        history: dict[int, float],
+    ) -> None:
+        """Append scrobbles to the scrobble log once their queue is on disk.
+
+        Runs on the writer thread, after the save of the queue, so `saved`
+        has already resolved. If it failed, the scrobbles are held back until
+        a later save succeeds. The history file is rewritten once the log
+        grows past SCROBBLE_LOG_COMPACT_SIZE.
+
+        Args:
+            saved: The save of the queue holding the scrobbles
+            scrobbles: Keys and times of the scrobbled tracks
+            history: Copy of the scrobble history, taken with the scrobbles
+        """
+        self._held_scrobbles.extend(scrobbles)
+        if not saved.result():
+            return
+        for track_id, scrobbled_at in self._held_scrobbles:
+            self.append_scrobble(track_id, scrobbled_at)
+        self._held_scrobbles.clear()
+        if self._scrobble_log_fh.tell() > SCROBBLE_LOG_COMPACT_SIZE:
+            self.compact_scrobble_history(history)
+
+    def flush_scrobbles(self) -> None:
+        """Submit all queued scrobbles to Last.fm in batched requests.
+
+        Requests are rate limited, and rate limit or temporary outage errors
+        are retried with exponential backoff. Tracks stay queued if a request
+        still fails and are retried on the next flush, unless Last.fm rejected
+        them outright, in which case they are dropped. The queue is persisted
+        before anything is sent, so a crash during a long submit or backoff
+        doesn't lose it, and again once the flush is done.
+
+        Only one flush runs at a time; a second call waits for the first.
+        After a failed flush, `start_flush` waits FLUSH_RETRY_DELAY seconds
+        before the next one, doubling with each failure in a row up to
+        SCROBBLE_MAX_BACKOFF.
+        """
+        with self._flush_lock:
+            self.save_pending_scrobbles().result()
+            submitted: bool = False
+            try:
+                submitted = self._submit_scrobbles()
+            finally:
+                self.save_pending_scrobbles()
+                self.schedule_next_flush(succeeded=submitted)
+
+    def schedule_next_flush(self, *, succeeded: bool) -> None:
+        """Carry the backoff over to the next flush.
+
+        Args:
+            succeeded: Whether the flush emptied the queue
+        """
+        if succeeded:
+            self._flush_failures = 0
+            self._next_flush_at = 0.0
+            return
+        delay: int = min(
+            SCROBBLE_MAX_BACKOFF,
+            FLUSH_RETRY_DELAY * 2**self._flush_failures,
+        )
+        self._flush_failures += 1
+        self._next_flush_at = time.monotonic() + delay
+        logger.info(
+            "Retrying %d queued scrobbles in %ds",
+            len(self._pending_scrobbles),
+            delay,
+        )
+
+    def _submit_scrobbles(self) -> bool:
+        """Submit the scrobble queue in batches of at most SCROBBLE_REQUEST_LIMIT.
+
+        Each batch leaves the queue, which is then persisted, as soon as
+        Last.fm accepts or rejects it, so a later failure never submits it
+        again. Submission stops at the first batch that has to stay queued.
+
+        Returns:
+            True if every batch was done with, False if some have to stay
+            queued
+        """
+        if self.network is None:
+            return True
+        while self._pending_scrobbles:
+            batch: list[dict[str, Any]] = self._pending_scrobbles[
+                :SCROBBLE_REQUEST_LIMIT
+            ]
+            if not self._submit_batch(self.network, batch):
+                return False
+            del self._pending_scrobbles[: len(batch)]
+            self._pending_dirty = True
+            self.save_pending_scrobbles()
+        return True
+
+    def _submit_batch(
+        self,
+        network: pylast.LastFMNetwork,
+        batch: list[dict[str, Any]],
+    ) -> bool:
+        """Submit one batch of scrobbles in a single request.
+
+        Args:
+            network: The Last.fm network to submit to
+            batch: The tracks to scrobble
+
+        Returns:
+            True if the batch is done with, whether Last.fm accepted it or
+            rejected it outright. False if it has to stay queued.
+        """
+        for attempt in range(SCROBBLE_MAX_RETRIES + 1):
+            self._lastfm_limiter.acquire()
+            try:
+                network.scrobble_many(batch)
+            except pylast.WSError as e:
+                status: str = str(e.status)
+                if status == str(pylast.STATUS_INVALID_SK) and attempt == 0:
+                    # The cached session key was revoked; log in again once
+                    logger.warning("Last.fm session key rejected, renewing it")
                     try:
-                        speaker_id: str = speaker.ip_address
-                        track_info: dict[str, Any] = self.update_track_info(speaker)
+                        self.refresh_session_key()
+                    except Exception:
+                        logger.exception("Error renewing Last.fm session key")
+                        return False
+                    continue
+                retryable: bool = (
+                    status in RETRYABLE_LASTFM_STATUSES
+                    or "rate limit" in str(e).lower()
+                )
+                if not retryable and status not in LASTFM_CREDENTIAL_STATUSES:
+                    # Resending a request Last.fm refused would fail the same
+                    # way every time and hold up every later scrobble
+                    self.drop_rejected_scrobbles(batch, e)
+                    return True
+                if not retryable or attempt == SCROBBLE_MAX_RETRIES:
+                    logger.exception("Error scrobbling %d queued tracks", len(batch))
+                    custom_print("Error scrobbling track", "ERROR")
+                    return False
+                # Jitter only spreads retries out, so any random source will do
+                jitter: float = random.random()  # noqa: S311
+                delay: float = min(SCROBBLE_MAX_BACKOFF, 2**attempt + jitter)
+                logger.warning(
+                    "Last.fm unavailable (%s), retrying in %.1fs",
+                    e,
+                    delay,
+                )
+                time.sleep(delay)
+            except Exception:
+                logger.exception("Error scrobbling %d queued tracks", len(batch))
+                custom_print("Error scrobbling track", "ERROR")
+                return False
+            else:
+                for track in batch:
+                    custom_print(f"Scrobbled: {track['artist']} - {track['title']}")
+                return True
+        return False
 
-                        if not track_info:
-                            continue
+    @staticmethod
+    def drop_rejected_scrobbles(
+        tracks: list[dict[str, Any]],
+        error: Exception,
+    ) -> None:
+        """Log scrobbles that Last.fm permanently rejected before dropping them.
 
-                        # Check if this is a new track
-                        prev_track: dict[str, Any] = self.previous_tracks.get(
-                            speaker_id,
-                            {},
-                        )
-                        current_track_id: str = (
-                            f"{track_info.get('artist', '')}-"
-                            f"{track_info.get('title', '')}"
-                        )
-                        prev_track_id: str = (
-                            f"{prev_track.get('artist', '')}-"
-                            f"{prev_track.get('title', '')}"
-                        )
+        Args:
+            tracks: The rejected tracks
+            error: The error Last.fm answered the submission with
+        """
+        logger.error(
+            "Last.fm rejected %d queued tracks, dropping them: %s",
+            len(tracks),
+            error,
+        )
+        for track in tracks:
+            custom_print(
+                f"Dropped scrobble: {track['artist']} - {track['title']}",
+                "ERROR",
+            )
 
-                        if (
-                            current_track_id != prev_track_id
-                            and track_info.get("artist")
-                            and track_info.get("title")
-                            and track_info["state"] == "PLAYING"
-                        ):
-                            custom_print(
-                                "Now playing on "
-                                f"{speaker.player_name}: "
-                                f"{track_info['artist']} - "
-                                f"{track_info['title']}",
-                            )
-
-                        # Update previous track info
-                        self.previous_tracks[speaker_id] = track_info.copy()
-
-                        # Update currently playing info
-                        self.currently_playing[speaker_id] = track_info
-                        self.save_json(
-                            self.currently_playing_file, self.currently_playing
-                        )
+    def start_flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Flush the scrobble queue on the worker pool without waiting for it.
 
-                        # Prepare display info for this speaker
-                        threshold: int = int(
-                            track_info["duration"]
-                            * self.scrobble_threshold_percent
-                            / 100,
-                        )
-                        display_info[speaker_id] = {
-                            "speaker_name": speaker.player_name,
-                            "artist": track_info["artist"],
-                            "title": track_info["title"],
-                            "position": track_info["position"],
-                            "duration": track_info["duration"],
-                            "threshold": threshold,
-                            "state": track_info["state"],
-                        }
-
-                        # Check if track should be scrobbled (only log scrobble events)
-                        if track_info["state"] == "PLAYING" and self.should_scrobble(
-                            track_info,
-                            speaker_id,
-                        ):
-                            track_info["speaker"] = speaker.player_name
-                            track_info["speaker_id"] = speaker_id
-                            self.scrobble_track(track_info)
+        A Last.fm backoff then never holds up polling. Nothing is started
+        while the previous flush is still running, or before the backoff
+        after a failed one has passed.
+
+        Args:
+            loop: The running event loop
+        """
+        if (
+            self._pending_scrobbles
+            and (self._flush is None or self._flush.done())
+            and time.monotonic() >= self._next_flush_at
+        ):
+            self._flush = loop.run_in_executor(self._pool, self.flush_scrobbles)
+
+    async def rediscover_speakers(self) -> None:
+        """Rediscover speakers every SPEAKER_REDISCOVERY_INTERVAL seconds.
+
+        Discovery runs on the worker pool, and the monitoring loop picks up
+        the new speaker list on its next iteration.
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        while True:
+            # Speakers were just discovered (or are being reconciled) in __init__
+            await asyncio.sleep(self.speaker_rediscovery_interval)
+            await loop.run_in_executor(self._pool, self.discover_speakers)
+
+    def process_track_info(
+        self,
+        speaker: SoCo,
+        track_info: dict[str, Any],
+        now: datetime,
+    ) -> SpeakerDisplayInfo:
+        """Record the track a speaker is playing, scrobbling it once it qualifies.
 
+        Args:
+            speaker: The Sonos speaker that was polled
+            track_info: Its current track information
+            now: Time of the current monitoring pass
+
+        Returns:
+            The speaker's row in the progress display
+        """
+        speaker_id: str = speaker.ip_address
+        speaker_name: str = self.speaker_name(speaker)
+
+        # Check if this is a new track
+        prev_track: dict[str, Any] = self.previous_tracks.get(speaker_id, {})
+        if (
+            make_track_id(track_info) != prev_track.get("track_id")
+            and track_info.get("artist")
+            and track_info.get("title")
+            and track_info["state"] == "PLAYING"
+        ):
+            custom_print(
+                f"Now playing on {speaker_name}: "
+                f"{track_info['artist']} - {track_info['title']}",
+            )
+
+        # Update previous track info
+        self.previous_tracks[speaker_id] = track_info.copy()
+
+        # Update currently playing info
+        self.record_playing(speaker_id, track_info)
+
+        # Prepare display info for this speaker
+        display_info: SpeakerDisplayInfo = SpeakerDisplayInfo(
+            speaker_name=speaker_name,
+            artist=track_info["artist"],
+            title=track_info["title"],
+            position=track_info["position"],
+            duration=track_info["duration"],
+            threshold=int(track_info["duration"] * self._threshold_ratio),
+            state=track_info["state"],
+        )
+
+        # Check if track should be scrobbled (only log scrobble events)
+        if track_info["state"] == "PLAYING" and self.should_scrobble(
+            track_info,
+            speaker_id,
+            now,
+        ):
+            track_info["speaker"] = speaker_name
+            track_info["speaker_id"] = speaker_id
+            self.scrobble_track(track_info, now)
+
+        return display_info
+
+    async def monitor_speakers(self) -> None:
+        """Main loop to monitor speakers and scrobble tracks.
+
+        Blocking network calls (speaker queries, rediscovery and Last.fm
+        submissions) run on the worker pool so the loop stays responsive.
+        """
+        custom_print("Starting Sonos Last.fm Scrobbler")
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        display_info: dict[str, SpeakerDisplayInfo] = {}
+        # With zeroconf, the browser keeps the speaker list up to date
+        rediscovery: asyncio.Task[None] | None = (
+            asyncio.create_task(self.rediscover_speakers())
+            if self._zeroconf is None
+            else None
+        )
+        # Iterations start on a fixed cadence regardless of how long polling took
+        next_deadline: float = time.monotonic() + self.scrobble_interval
+        try:
+            while True:
+                # One timestamp for everything that happens during this pass
+                now: datetime = datetime.now(UTC)
+                current_time: float = now.timestamp()
+                display_info.clear()  # Reset display info each iteration
+
+                for speaker, track_info in await self.poll_speakers():
+                    if not track_info:
+                        continue
+                    try:
+                        display_info[speaker.ip_address] = self.process_track_info(
+                            speaker,
+                            track_info,
+                            now,
+                        )
                     except Exception:
                         logger.exception(
                             "Error monitoring %s",
-                            speaker.player_name,
+                            self.speaker_name(speaker),
                         )
 
-                # Update all progress displays together
+                self.commit_scrobbles()
+                self.start_flush(loop)
+
+                if (
+                    current_time - self._last_compaction_time
+                    >= COMPACTION_INTERVAL
+                ):
+                    self.compact_state()
+
+                # Update all progress displays together; the display skips
+                # the redraw when nothing visible changed
                 if display_info:
                     update_all_progress_displays(display_info)
 
-                time.sleep(self.scrobble_interval)
-        except KeyboardInterrupt:
+                next_deadline = await self.wait_for_deadline(next_deadline)
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            # asyncio.run cancels this task on Ctrl+C
             custom_print("\nShutting down...")  # Add newline before shutdown message
+            # Waits for a flush still running on the pool before submitting
+            # whatever it left queued
+            self.flush_scrobbles()
         except Exception:
             logger.exception("Unexpected error")
             custom_print("Unexpected error", "ERROR")
+        finally:
+            self.shutdown(rediscovery)
+
+    async def wait_for_deadline(self, deadline: float) -> float:
+        """Sleep until the next monitoring pass is due.
+
+        Args:
+            deadline: Monotonic time the next pass is due at
+
+        Returns:
+            Monotonic time the pass after it is due at
+        """
+        remaining: float = deadline - time.monotonic()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+            return deadline + self.scrobble_interval
+        logger.warning(
+            "Monitoring iteration overran the %ss interval by %.1fs",
+            self.scrobble_interval,
+            -remaining,
+        )
+        # Start the next iteration now instead of catching up
+        return time.monotonic() + self.scrobble_interval
+
+    def shutdown(self, rediscovery: asyncio.Task[None] | None) -> None:
+        """Stop background work and write out the remaining state.
+
+        Args:
+            rediscovery: The periodic rediscovery task, if one was started
+        """
+        if rediscovery is not None:
+            rediscovery.cancel()
+        if self._zeroconf is not None:
+            self._zeroconf.close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self.unsubscribe_all()
+        self.commit_scrobbles()
+        self.queue_write(self.compact_scrobble_history, self.last_scrobbled.copy())
+        self.compact_state()
+        # Every queued write lands before the files are closed
+        self._writer.shutdown(wait=True)
+        self._events_fh.close()
+        self._scrobble_log_fh.close()
 
     def run(self) -> None:
         """Start the scrobbler."""
-        self.monitor_speakers()
+        asyncio.run(self.monitor_speakers())
 
 
 if __name__ == "__main__":
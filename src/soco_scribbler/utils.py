@@ -1,30 +1,105 @@
 """Utility functions for the Sonos Last.fm scrobbler."""
 
 import logging
+import os
 import sys
+import threading
+import time
 from collections.abc import Mapping
-from typing import Any
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, TextIO
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
-# Track display state
-_last_line_count: int = 0
-_display_started: bool = False
-_log_lines_since_last_display: int = 0
+# Redraws closer together than this are skipped unless a track or state changed
+_MIN_REFRESH_INTERVAL: float = float(os.getenv("SCROBBLE_DISPLAY_INTERVAL", "0.2"))
 
+_BAR_WIDTH: int = 50  # Progress bar width in characters
+# Bar shown for a track without a known duration
+_EMPTY_BAR: str = "[" + " " * _BAR_WIDTH + "] 0%"
+_SPEAKER_BLOCK_LINES: int = 4  # Status, bar, time and a blank separator
 
-class LogLineCounter(logging.Handler):
-    """Handler that counts log lines for display management."""
+# "MM:SS" for every time under an hour, which covers nearly every track
+_MMSS: tuple[str, ...] = tuple(f"{s // 60:02d}:{s % 60:02d}" for s in range(3600))
 
-    def emit(self, _record: logging.LogRecord) -> None:
-        """Process a log record by incrementing the line counter."""
-        global _log_lines_since_last_display
-        _log_lines_since_last_display += 1
+# Cursor up (CUU), cursor down (CUD) and delete line (DL) sequences by count
+_ANSI_TABLE_SIZE: int = 512
+_CUU: tuple[str, ...] = tuple(f"\033[{n}A" for n in range(_ANSI_TABLE_SIZE))
+_CUD: tuple[str, ...] = tuple(f"\033[{n}B" for n in range(_ANSI_TABLE_SIZE))
+_DL: tuple[str, ...] = tuple(f"\033[{n}M" for n in range(_ANSI_TABLE_SIZE))
 
 
-# Add our custom handler to the root logger
-logging.getLogger().addHandler(LogLineCounter())
+class LineCountingStream:
+    """Stream wrapper that counts the lines written for display management.
+
+    Wrapping the log handler's stream counts the lines that actually reach
+    the terminal, including multi-line tracebacks, rather than log records.
+    Nothing is counted when the stream is redirected, since those lines never
+    push the display up.
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        """Wrap a stream.
+
+        Args:
+            stream: The stream to write to
+        """
+        self._stream = stream
+        self._on_terminal: bool = stream.isatty()
+
+    def write(self, text: str) -> int:
+        """Write text to the wrapped stream, counting its newlines."""
+        if self._on_terminal:
+            _display.log_lines_since_last_display += text.count("\n")
+        return self._stream.write(text)
+
+    def flush(self) -> None:
+        """Flush the wrapped stream."""
+        self._stream.flush()
+
+    def isatty(self) -> bool:
+        """Report whether the wrapped stream is a terminal."""
+        return self._on_terminal
+
+    # Any attribute of the wrapped stream can be asked for, so there's no
+    # narrower type to give
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        """Delegate everything else (fileno, encoding, ...) to the stream."""
+        return getattr(self._stream, name)
+
+
+class TokenBucket:
+    """Thread-safe token bucket used to cap the rate of outbound requests."""
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        """Create a full bucket.
+
+        Args:
+            rate: Number of tokens added per second
+            capacity: Maximum number of tokens the bucket can hold
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens: float = capacity
+        self._updated: float = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take a token, sleeping until one is available."""
+        with self._lock:
+            now: float = time.monotonic()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated) * self.rate,
+            )
+            self._updated = now
+            # Going negative reserves a future token for this caller
+            self._tokens -= 1
+            wait: float = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
 
 
 def custom_print(message: str, level: str = "INFO") -> None:
@@ -37,31 +112,24 @@ def custom_print(message: str, level: str = "INFO") -> None:
     # Count how many newlines are in the message
     newline_count: int = message.count("\n")
 
-    # Format the message with timestamp and level
-    timestamp: str = logging.Formatter("%(asctime)s").format(
-        logging.LogRecord("", 0, "", 0, None, None, None),
-    )
-    formatted_message: str = f"{timestamp[:-4]} - {level} - {message}"
+    # Format the message with timestamp and level, matching the log format's
+    # asctime without building a throwaway log record and formatter
+    timestamp: str = time.strftime("%Y-%m-%d %H:%M:%S")
+    formatted_message: str = f"{timestamp} - {level} - {message}"
 
-    # Print the message
-    print(formatted_message, flush=True)  # noqa: T201
+    # Print the message and its newline in one write
+    sys.stdout.write(formatted_message + "\n")
+    sys.stdout.flush()
 
     # Update the line counter
-    global _log_lines_since_last_display
-    _log_lines_since_last_display += 1 + newline_count
-
-
-def reset_log_line_counter() -> None:
-    """Reset the counter for log lines since last display update."""
-    global _log_lines_since_last_display
-    _log_lines_since_last_display = 0
+    _display.log_lines_since_last_display += 1 + newline_count
 
 
 def create_progress_bar(
     current: int,
     total: int,
     threshold: int,
-    width: int = 50,
+    width: int = _BAR_WIDTH,
 ) -> str:
     """Create an ASCII progress bar showing current position and scrobble threshold.
 
@@ -74,101 +142,252 @@ def create_progress_bar(
     Returns:
         A string containing the progress bar
     """
-    if total == 0:
-        return "[" + " " * width + "] 0%"
+    if total <= 0:
+        return _EMPTY_BAR if width == _BAR_WIDTH else "[" + " " * width + "] 0%"
 
     # Calculate exact percentage and positions
-    percentage: int = (current * 100) // total if total > 0 else 0
-    progress: int = int((current * width) / total) if total > 0 else 0
-    threshold_pos: int = int((threshold * width) / total) if total > 0 else 0
+    return _render_bar(
+        (current * width) // total,
+        (threshold * width) // total,
+        (current * 100) // total,
+        width,
+    )
+
+
+@lru_cache(maxsize=1024)
+def _render_bar(progress: int, threshold_pos: int, percentage: int, width: int) -> str:
+    """Render a progress bar from its character positions.
+
+    Consecutive polls mostly land on the same characters, so bars are cached.
 
+    Args:
+        progress: Number of filled cells
+        threshold_pos: Cell holding the scrobble threshold marker
+        percentage: Percentage shown after the bar
+        width: Width of the progress bar in characters
+
+    Returns:
+        A string containing the progress bar
+    """
     # Create the bar
-    bar: list[str] = list("." * width)
+    bar: bytearray = bytearray(b"." * width)
 
     # Add threshold marker
     if 0 <= threshold_pos < width:
-        bar[threshold_pos] = "|"
+        bar[threshold_pos] = ord("|")
 
-    # Fill progress
-    for i in range(progress):
-        if i < width:
-            bar[i] = "="
+    # Fill progress, clamped so the slice can't grow the bar
+    filled: int = min(max(progress, 0), width)
+    bar[:filled] = b"=" * filled
 
     # Add position marker (only if within bounds)
     if 0 <= progress < width:
-        bar[progress] = ">"
+        bar[progress] = ord(">")
 
-    return f"[{''.join(bar)}] {percentage}%"
+    return f"[{bar.decode('ascii')}] {percentage}%"
 
 
-def update_all_progress_displays(speakers_info: Mapping[str, dict[str, Any]]) -> None:
-    """Update progress display for all speakers in a coordinated way.
+def _ansi(table: tuple[str, ...], n: int, final: str) -> str:
+    """Look up a counted escape sequence, building it if it's off the table.
 
     Args:
-        speakers_info: Dictionary mapping speaker IDs to their current track info
-            Each track info should contain:
-            - speaker_name: str
-            - artist: str
-            - title: str
-            - position: int (seconds)
-            - duration: int (seconds)
-            - threshold: int (seconds)
-            - state: str
+        table: Precomputed sequences indexed by count
+        n: The count
+        final: The sequence's final character, used when n is off the table
+
+    Returns:
+        The escape sequence
     """
-    global _last_line_count, _display_started, _log_lines_since_last_display
+    return table[n] if 0 <= n < len(table) else f"\033[{n}{final}"
+
 
-    # Prepare the display content
-    lines: list[str] = []
+def format_mmss(seconds: int) -> str:
+    """Format a time as MM:SS, using the precomputed table when possible.
 
-    # Generate display for each speaker
-    for speaker_info in speakers_info.values():
-        current: int = speaker_info["position"]
-        total: int = speaker_info["duration"]
+    Args:
+        seconds: Time in seconds
+
+    Returns:
+        The time as MM:SS; minutes can exceed two digits
+    """
+    if 0 <= seconds < len(_MMSS):
+        return _MMSS[seconds]
+    minutes, secs = divmod(seconds, 60)
+    return f"{minutes:02d}:{secs:02d}"
+
+
+@dataclass(slots=True, frozen=True)
+class SpeakerDisplayInfo:
+    """What the progress display shows for one speaker."""
+
+    speaker_name: str
+    artist: str | None  # None when the speaker doesn't report it
+    title: str | None
+    position: int  # seconds
+    duration: int  # seconds
+    threshold: int  # seconds
+    state: str
+
+
+class ProgressDisplay:
+    """Progress display redrawn in place below the log output."""
+
+    def __init__(self, min_refresh_interval: float = _MIN_REFRESH_INTERVAL) -> None:
+        """Create a display that hasn't been drawn yet.
+
+        Args:
+            min_refresh_interval: Minimum seconds between redraws that only
+                move the playback positions
+        """
+        self.min_refresh_interval = min_refresh_interval
+        # Redirected output (a file, journald, docker logs) can't be redrawn
+        self.is_tty: bool = sys.stdout.isatty()
+        # Lines printed below the display since it was last drawn
+        self.log_lines_since_last_display: int = 0
+        self._last_line_count: int = 0
+        self._display_started: bool = False
+        self._last_render_ts: float = 0.0
+        self._last_signature: tuple[tuple[str, str, str | None], ...] | None = None
+        self._last_rows: tuple[tuple[str, SpeakerDisplayInfo], ...] | None = None
+        # Per speaker "name: artist - title" prefix of the status line, and
+        # its inputs
+        self._status_cache: dict[
+            str,
+            tuple[tuple[str, str | None, str | None], str],
+        ] = {}
+        # Per speaker info last drawn and its formatted block; idle speakers
+        # (paused or stopped) are redrawn from here without any formatting
+        self._block_cache: dict[str, tuple[SpeakerDisplayInfo, str]] = {}
+
+    def render(self, speakers_info: Mapping[str, SpeakerDisplayInfo]) -> None:
+        """Redraw the display, replacing the previous frame.
+
+        Args:
+            speakers_info: Dictionary mapping speaker IDs to their current
+                track info
+        """
+        # Nothing visible changed, e.g. every speaker is paused or stopped
+        rows: tuple[tuple[str, SpeakerDisplayInfo], ...] = tuple(
+            speakers_info.items(),
+        )
+        if rows == self._last_rows:
+            return
+
+        # Only position changes are rate limited; speakers appearing or leaving
+        # and track or state changes are always shown straight away
+        now: float = time.monotonic()
+        signature: tuple[tuple[str, str, str | None], ...] = tuple(
+            (speaker_id, info.state, info.title)
+            for speaker_id, info in speakers_info.items()
+        )
+        if signature == self._last_signature and (
+            not self.is_tty or now - self._last_render_ts < self.min_refresh_interval
+        ):
+            # Without a terminal, frames are appended rather than replaced, so
+            # only track and state changes are worth a frame
+            return
+
+        # Calculate total lines including header
+        blocks: list[str] = []
+        for speaker_id, info in speakers_info.items():
+            cached: tuple[SpeakerDisplayInfo, str] | None = self._block_cache.get(
+                speaker_id,
+            )
+            if cached is not None and cached[0] == info:
+                blocks.append(cached[1])
+                continue
+            block: str = self._speaker_block(speaker_id, info)
+            self._block_cache[speaker_id] = (info, block)
+            blocks.append(block)
+        if len(self._block_cache) > len(speakers_info):
+            # Forget speakers that have left
+            for speaker_id in self._block_cache.keys() - speakers_info.keys():
+                del self._block_cache[speaker_id]
+                self._status_cache.pop(speaker_id, None)
+        total_lines: int = 1 + _SPEAKER_BLOCK_LINES * len(blocks)
+
+        # The whole frame goes out in a single write
+        frame: list[str] = []
+        if self._display_started and self.is_tty:
+            # BEGIN OF IMPORTANT CODE #
+            clean_up_lines: int = self._last_line_count
+            log_lines: int = self.log_lines_since_last_display
+            total_move_up: int = log_lines + clean_up_lines
+
+            # Move cursor up by total_move_up lines
+            frame.append(_ansi(_CUU, total_move_up, "A"))
+            # Delete all previous display lines in one go; the lines logged
+            # since move up in their place and the cursor stays put
+            frame.append(_ansi(_DL, clean_up_lines, "M"))
+            # Skip past the logged lines so they stay above the new display
+            if log_lines:
+                frame.append(_ansi(_CUD, log_lines, "B"))
+            # END of IMPORANT CODE #
+
+        frame.append("=== Progress Display ===\n")
+        frame.extend(blocks)
+        sys.stdout.write("".join(frame))
+        sys.stdout.flush()
+        self._display_started = True
+        self._last_line_count = total_lines
+
+        self._last_render_ts = now
+        self._last_signature = signature
+        self._last_rows = rows
+
+        # Reset the log line counter
+        self.log_lines_since_last_display = 0
+
+    def _speaker_block(self, speaker_id: str, info: SpeakerDisplayInfo) -> str:
+        """Format the display block for one speaker.
+
+        Args:
+            speaker_id: ID of the speaker
+            info: The speaker's current track info
+
+        Returns:
+            The status, progress bar, time and blank separator lines, each
+            ending in a newline
+        """
+        current: int = info.position
+        total: int = info.duration
 
         # Format time as MM:SS
-        current_time: str = f"{current // 60:02d}:{current % 60:02d}"
-        total_time: str = f"{total // 60:02d}:{total % 60:02d}"
-
-        # Create status lines
-        status: str = (
-            f"{speaker_info['speaker_name']}: "
-            f"{speaker_info['artist']} - {speaker_info['title']} "
-            f"[{speaker_info['state']}]"
+        current_time: str = format_mmss(current)
+        total_time: str = format_mmss(total)
+
+        # Create status lines; the prefix only changes with the track
+        key: tuple[str, str | None, str | None] = (
+            info.speaker_name,
+            info.artist,
+            info.title,
+        )
+        cached: tuple[tuple[str, str | None, str | None], str] | None = (
+            self._status_cache.get(speaker_id)
         )
-        progress: str = create_progress_bar(current, total, speaker_info["threshold"])
+        if cached is not None and cached[0] == key:
+            prefix: str = cached[1]
+        else:
+            prefix = f"{key[0]}: {key[1]} - {key[2]}"
+            self._status_cache[speaker_id] = (key, prefix)
+        status: str = f"{prefix} [{info.state}]"
+        progress: str = create_progress_bar(current, total, info.threshold)
         percentage: int = (current * 100) // total if total > 0 else 0
         time_display: str = f"Time: {current_time}/{total_time} ({percentage}%)"
 
-        # Add this speaker's display
-        lines.extend([status, progress, time_display, ""])
-
-    # Calculate total lines including header
-    display_lines: list[str] = ["=== Progress Display ===", *lines]
-    total_lines: int = len(display_lines)
-
-    if not _display_started:
-        # First time display
-        print("\n".join(display_lines), flush=True)  # noqa: T201
-        _display_started = True
-        _last_line_count = total_lines
-    else:
-        # BEGIN OF IMPORTANT CODE #
-        clean_up_lines: int = _last_line_count
-        total_move_up: int = _log_lines_since_last_display + clean_up_lines
-
-        # Move cursor up by total_move_up lines
-        sys.stdout.write(f"\033[{total_move_up}A")
-        # Clear all previous display lines
-        for _ in range(clean_up_lines):
-            sys.stdout.write("\033[K")  # Clear current line
-            sys.stdout.write("\033[1B")  # Move down 1 line
-        # Move back to start position
-        sys.stdout.write(f"\033[{clean_up_lines}A")
-        # END of IMPORANT CODE #
-
-        # Write new display
-        print("\n".join(display_lines), flush=True)  # noqa: T201
-        _last_line_count = total_lines
-
-    # Reset the log line counter
-    reset_log_line_counter()
+        return f"{status}\n{progress}\n{time_display}\n\n"
+
+
+# The display shared by the scrobbler and the log line counters
+_display: ProgressDisplay = ProgressDisplay()
+
+
+def update_all_progress_displays(
+    speakers_info: Mapping[str, SpeakerDisplayInfo],
+) -> None:
+    """Update progress display for all speakers in a coordinated way.
+
+    Args:
+        speakers_info: Dictionary mapping speaker IDs to their current track info
+    """
+    _display.render(speakers_info)